@@ -24,7 +24,9 @@ CREATE TABLE IF NOT EXISTS projects (
     created_at_timestamp BIGINT,
     updated_at_timestamp BIGINT,
     status VARCHAR(50) DEFAULT 'pending',  -- 采集状态：pending(待采集), collecting(采集ing), completed(完成), failed(失败)
-    last_error TEXT  -- 错误信息，失败时存储
+    last_error TEXT,  -- 错误信息，失败时存储
+    created_month CHAR(7) AS (DATE_FORMAT(created_at, '%Y-%m')) STORED,  -- 创建月份，供按月统计使用索引分组
+    updated_month CHAR(7) AS (DATE_FORMAT(updated_at, '%Y-%m')) STORED   -- 更新月份
 );
 
 -- 项目语言分布表
@@ -123,13 +125,45 @@ CREATE TABLE IF NOT EXISTS pull_requests (
     UNIQUE KEY unique_pr (project_id, pr_number)
 );
 
+-- 语言统计汇总表（由数据分析模块在采集完成后刷新，避免每次分析全表扫描languages和projects）
+CREATE TABLE IF NOT EXISTS mv_language_stats (
+    language_name VARCHAR(50) PRIMARY KEY,
+    project_count INT NOT NULL,
+    total_percentage DOUBLE,
+    avg_stars DOUBLE,
+    avg_forks DOUBLE,
+    refreshed_at DATETIME NOT NULL
+);
+
+-- 描述领域计数汇总表（刷新方式同上，避免每次分析都对全部项目描述做正则匹配）
+CREATE TABLE IF NOT EXISTS mv_domain_counts (
+    domain VARCHAR(50) PRIMARY KEY,
+    project_count INT NOT NULL,
+    refreshed_at DATETIME NOT NULL
+);
+
+-- 汇总表刷新记录（单行）：源表没有数据时汇总表刷新后仍为空，以此判断是否已刷新过；
+-- fingerprint为刷新时源数据的指纹（各表行数、项目最近更新时间等的SHA-1），与当前数据不一致时重新刷新
+CREATE TABLE IF NOT EXISTS mv_refresh_log (
+    id TINYINT PRIMARY KEY,
+    refreshed_at DATETIME NOT NULL,
+    fingerprint CHAR(40)
+);
+
 -- 索引优化
 CREATE INDEX idx_projects_stargazers ON projects(stargazers_count);
 CREATE INDEX idx_projects_forks ON projects(forks_count);
 CREATE INDEX idx_projects_updated_at ON projects(updated_at);
+CREATE INDEX idx_projects_created_at ON projects(created_at);
+CREATE INDEX idx_projects_created_month ON projects(created_month);
+CREATE INDEX idx_projects_updated_month ON projects(updated_month);
+CREATE INDEX idx_projects_license_name ON projects(license_name);
 CREATE INDEX idx_contributors_location ON contributors(location);
+CREATE INDEX idx_contributors_company ON contributors(company);
+CREATE INDEX idx_contributors_created_at ON contributors(created_at);
 CREATE INDEX idx_commits_created_at ON commits(created_at);
-CREATE INDEX idx_languages_language_name ON languages(language_name);
+-- 覆盖索引：按语言分组统计项目数时无需回表
+CREATE INDEX idx_languages_language_project ON languages(language_name, project_id);
 CREATE INDEX idx_topics_topic_name ON topics(topic_name);
 CREATE INDEX idx_pull_requests_created_at ON pull_requests(created_at);
 CREATE INDEX idx_pull_requests_state ON pull_requests(state);
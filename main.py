@@ -8,7 +8,7 @@ from src.utils.logger import error_logger, reporting_logger as logger
 from src.utils.database import db_manager
 from src.data_collection.data_collector import data_collector
 from src.data_processing.data_analyzer import data_analyzer
-from src.reporting.report_generator import report_generator
+from src.reporting.report_generator import ReportGenerator
 
 def setup_environment():
     """设置运行环境"""
@@ -27,6 +27,9 @@ def setup_environment():
     except Exception as e:
         error_logger.error(f"数据库连接失败: {e}")
         raise
+    
+    # 为早于当前init.sql创建的数据库补齐分析所需的列、表和索引
+    db_manager.ensure_schema()
 
 def collect_data():
     """采集GitHub项目数据"""
@@ -46,6 +49,13 @@ def collect_data():
     except Exception as e:
         error_logger.error(f"数据采集过程中发生错误: {e}")
         raise
+    finally:
+        # 数据已变化（采集中途出错时也可能已写入部分数据），刷新分析用的汇总表；
+        # 刷新失败不影响采集结果，分析前会根据数据指纹再次刷新
+        try:
+            data_analyzer.refresh_summary_tables()
+        except Exception as e:
+            error_logger.error(f"刷新汇总表失败: {e}")
 
 def analyze_data():
     """分析采集的数据"""
@@ -72,7 +82,8 @@ def generate_reports(analysis_results):
     start_time = time.time()
     
     try:
-        # 加载分析结果
+        # 每次生成报告使用独立的实例，加载分析结果
+        report_generator = ReportGenerator()
         report_generator.load_analysis_results(analysis_results)
         
         # 生成所有报告
@@ -97,7 +108,7 @@ def cleanup():
     
     # 关闭数据库连接
     try:
-        db_manager.disconnect()
+        db_manager.close_all()
         error_logger.info("数据库连接已关闭")
     except Exception as e:
         error_logger.error(f"关闭数据库连接时发生错误: {e}")
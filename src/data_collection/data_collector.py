@@ -1,7 +1,7 @@
 import time
 import logging
 from datetime import datetime, timezone
-from src.data_collection.github_api import github_api
+from src.data_collection.github_api import get_github_api
 from src.utils.database import db_manager
 from src.utils.logger import data_collection_logger
 from src.utils.config import config
@@ -12,13 +12,15 @@ class DataCollector:
     """GitHub数据采集器"""
     
     def __init__(self):
-        self.github_api = github_api
+        self.github_api = get_github_api()
         self.db_manager = db_manager
         # 提取为类常量，避免重复定义
         # 注意：用户确认2025年是正确的时间设置
         self.since_date = datetime(2025, 1, 1, tzinfo=timezone.utc)
         self.DEFAULT_MAX_COUNT = 2000  # 默认最大记录数
         self.CHECK_INTERVAL = 100  # 检查间隔
+        # 本次运行中已保存的贡献者ID缓存，同一贡献者出现在多个项目中时无需再次查询数据库
+        self.contributor_id_cache = {}
         logger.info("数据采集器初始化完成")
     
     def initialize_collection(self):
@@ -65,6 +67,7 @@ class DataCollector:
             logger.error(f"采集项目时发生错误: {e}")
             raise
         finally:
+            self.github_api.close()
             self.db_manager.disconnect()
     
     def _fetch_all_projects(self):
@@ -74,6 +77,8 @@ class DataCollector:
         # 构建搜索查询
         query = f"pushed:>{config.START_DATE} stars:>={config.MIN_STARS} forks:>={config.MIN_FORKS}"
         
+        max_projects = config.MAX_PROJECTS
+        
         try:
             # 搜索项目并只保存基本信息
             projects_saved = 0
@@ -83,8 +88,8 @@ class DataCollector:
                     projects_saved += 1
                     
                     # 检查是否达到最大项目数
-                    if projects_saved >= config.MAX_PROJECTS:
-                        logger.info(f"已达到最大项目数限制: {config.MAX_PROJECTS}")
+                    if projects_saved >= max_projects:
+                        logger.info(f"已达到最大项目数限制: {max_projects}")
                         break
                 except Exception as e:
                     logger.warning(f"保存仓库 {repo.full_name} 基本信息时出错，继续处理下一个仓库: {e}")
@@ -130,11 +135,14 @@ class DataCollector:
                     self._update_project_status(project_id, 'collecting')
                     
                     # 采集详细数据
+                    # 并发获取语言和主题标签信息
+                    repo_summary = self.github_api.get_repo_summary(repo)
+                    
                     # 保存项目语言信息
-                    self._save_project_languages(repo)
+                    self._save_project_languages(repo, repo_summary['languages'])
                     
                     # 保存项目主题标签
-                    self._save_project_topics(repo)
+                    self._save_project_topics(repo, repo_summary['topics'])
                     
                     # 保存项目统计信息
                     self._save_project_statistics(repo)
@@ -260,8 +268,7 @@ class DataCollector:
                 'pending'  # 初始状态为待采集
             )
             
-            self.db_manager.execute_query(query, params)
-            project_id = self.db_manager.get_last_insert_id()
+            project_id = self.db_manager.execute_insert(query, params)
             
             return project_id
             
@@ -269,8 +276,13 @@ class DataCollector:
             logger.error(f"保存项目 {repo.full_name} 时出错: {e}")
             raise
     
-    def _save_project_languages(self, repo):
-        """保存项目语言信息"""
+    def _save_project_languages(self, repo, languages=None):
+        """保存项目语言信息
+        
+        Args:
+            repo: GitHub仓库对象
+            languages: 已获取的语言信息，None表示通过API获取
+        """
         try:
             logger.info(f"开始处理项目语言信息: {repo.full_name}")
             # 获取项目ID
@@ -283,33 +295,40 @@ class DataCollector:
             project_id = result[0]['id']
             
             # 获取语言信息
-            languages = self.github_api.get_project_languages(repo)
+            if languages is None:
+                languages = self.github_api.get_project_languages(repo)
             if not languages:
                 return
             
             # 计算总字节数
             total_bytes = sum(languages.values())
             
-            # 插入语言数据
+            # 一次遍历计算所有语言的占比，并批量插入语言数据
+            query = """
+            INSERT INTO languages (project_id, language_name, bytes_count, percentage)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE bytes_count = %s, percentage = %s
+            """
+            
+            params_list = []
             for language_name, bytes_count in languages.items():
                 percentage = (bytes_count / total_bytes) * 100 if total_bytes > 0 else 0
-                
-                query = """
-                INSERT INTO languages (project_id, language_name, bytes_count, percentage)
-                VALUES (%s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE bytes_count = %s, percentage = %s
-                """
-                
-                params = (project_id, language_name, bytes_count, percentage, bytes_count, percentage)
-                self.db_manager.execute_query(query, params)
+                params_list.append((project_id, language_name, bytes_count, percentage, bytes_count, percentage))
+            
+            self.db_manager.execute_many(query, params_list)
             
             logger.info(f"项目语言信息处理完成: {repo.full_name}")
             
         except Exception as e:
             logger.error(f"保存项目 {repo.full_name} 语言信息时出错: {e}")
     
-    def _save_project_topics(self, repo):
-        """保存项目主题标签"""
+    def _save_project_topics(self, repo, topics=None):
+        """保存项目主题标签
+        
+        Args:
+            repo: GitHub仓库对象
+            topics: 已获取的主题标签列表，None表示通过API获取
+        """
         try:
             logger.info(f"开始处理项目主题标签: {repo.full_name}")
             # 获取项目ID
@@ -322,7 +341,8 @@ class DataCollector:
             project_id = result[0]['id']
             
             # 获取主题标签
-            topics = self.github_api.get_project_topics(repo)
+            if topics is None:
+                topics = self.github_api.get_project_topics(repo)
             
             # 插入主题标签数据
             for topic in topics:
@@ -575,8 +595,8 @@ class DataCollector:
             since_date = self.since_date
             logger.info(f"开始从commit数据获取项目 {repo.full_name} 的2025年以来的贡献者和提交记录")
             
-            # 用于跟踪已处理的贡献者，避免重复处理
-            processed_contributors = set()
+            # 用于跟踪已处理的贡献者及其ID，避免重复处理和重复查询
+            processed_contributors = {}
             contributors_processed = 0
             commits_processed = 0
             
@@ -615,26 +635,20 @@ class DataCollector:
                             temp_contributor = TempContributor(commit_author.name, commit_author.email)
                             contributor_id = self._save_contributor(temp_contributor)
                             
-                            processed_contributors.add(temp_contributor_id)
+                            processed_contributors[temp_contributor_id] = contributor_id
                             contributors_processed += 1
                         else:
-                            # 如果是已存在的贡献者，查找其ID
-                            query = "SELECT github_id FROM contributors WHERE github_id = %s"
-                            result = self.db_manager.execute_query(query, (temp_contributor_id,))
-                            if result:
-                                contributor_id = result[0]['github_id']
+                            # 如果是已处理的贡献者，直接复用首次保存时得到的ID，无需再查询数据库
+                            contributor_id = processed_contributors[temp_contributor_id]
                     elif contributor:
                         # 如果有GitHub用户信息，使用正常的贡献者处理逻辑
                         if contributor.id not in processed_contributors:
                             contributor_id = self._save_contributor(contributor)
-                            processed_contributors.add(contributor.id)
+                            processed_contributors[contributor.id] = contributor_id
                             contributors_processed += 1
                         else:
-                            # 如果是已存在的贡献者，查找其ID
-                            query = "SELECT github_id FROM contributors WHERE github_id = %s"
-                            result = self.db_manager.execute_query(query, (contributor.id,))
-                            if result:
-                                contributor_id = result[0]['github_id']
+                            # 如果是已处理的贡献者，直接复用首次保存时得到的ID，无需再查询数据库
+                            contributor_id = processed_contributors[contributor.id]
                     
                     # 只有当contributor_id有效时才保存提交记录，避免外键约束错误
                     if contributor_id:
@@ -726,6 +740,9 @@ class DataCollector:
             Exception: 当数据库操作失败时抛出异常，但会被方法内部捕获并记录
         """
         try:
+            # 本次运行中已保存过的贡献者直接从缓存返回，跨项目复用
+            if contributor.id in self.contributor_id_cache:
+                return self.contributor_id_cache[contributor.id]
             
             # 检查贡献者是否已存在于数据库中
             # 使用GitHub用户ID作为唯一标识进行查询
@@ -736,6 +753,7 @@ class DataCollector:
             if result:
                 contributor_id = result[0]['github_id']
                 logger.info(f"贡献者 {contributor.login} 已存在，ID: {contributor_id}")
+                self.contributor_id_cache[contributor.id] = contributor_id
                 return contributor_id
             
             # 如果贡献者不存在，通过GitHub API获取更详细的用户信息
@@ -768,6 +786,7 @@ class DataCollector:
             
             # 由于github_id现在是主键，直接使用contributor.id作为返回值
             contributor_id = contributor.id
+            self.contributor_id_cache[contributor.id] = contributor_id
             
             # 返回新贡献者的ID
             return contributor_id
@@ -1,6 +1,8 @@
 from github import Github, GithubException
 import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from src.utils.config import config
 from src.utils.logger import data_collection_logger
@@ -11,6 +13,10 @@ logger = data_collection_logger
 class GitHubAPI:
     """GitHub API交互类"""
     
+    # 所有实例共享的信号量，限制并发发出的API请求数，避免并发请求过快消耗速率限制
+    MAX_CONCURRENT_REQUESTS = 4
+    _request_semaphore = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+    
     def __init__(self):
         self.github = None
         self.rate_limit_wait = config.GITHUB_API_RATE_LIMIT_WAIT
@@ -22,6 +28,33 @@ class GitHubAPI:
         self.user_cache = {}
         # 添加缓存TTL，单位秒
         self.cache_ttl = 3600  # 缓存1小时
+        # 用于并发获取互不依赖的项目信息的线程池，首次使用时创建
+        self.executor = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+    
+    def close(self):
+        """关闭底层HTTP连接池和线程池，释放网络资源
+        
+        关闭后再次调用API方法时会重新认证并创建所需资源。
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        
+        if self.github is not None:
+            try:
+                self.github.close()
+                logger.info("GitHub API连接已关闭")
+            except Exception as e:
+                logger.error(f"关闭GitHub API连接时出错: {e}")
+            finally:
+                self.github = None
     
     def authenticate(self):
         """认证GitHub API"""
@@ -55,7 +88,9 @@ class GitHubAPI:
             remaining, limit = self.github.rate_limiting
             reset_time = self.github.rate_limiting_resettime
             
-            logger.debug(f"API速率限制: 剩余 {remaining}/{limit} 次请求，重置时间: {datetime.fromtimestamp(reset_time)}")
+            # 仅在启用DEBUG日志时才格式化重置时间，避免每次API调用都创建datetime对象
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("API速率限制: 剩余 %d/%d 次请求，重置时间: %s", remaining, limit, datetime.fromtimestamp(reset_time))
             
             # 如果剩余请求次数不足，等待重置
             if remaining < self.BUFFER_REMAINING:
@@ -84,6 +119,11 @@ class GitHubAPI:
         
         logger.info(f"开始搜索项目: query={query}, sort={sort}, order={order}")
         
+        # 搜索开始时绑定筛选条件，避免循环中重复读取配置，也防止中途修改配置影响本次搜索
+        max_projects = config.MAX_PROJECTS
+        min_stars = config.MIN_STARS
+        min_forks = config.MIN_FORKS
+        
         try:
             # 执行搜索
             search_results = self.github.search_repositories(
@@ -96,10 +136,10 @@ class GitHubAPI:
             for repo in search_results:
                 # 检查速率限制
                 self.check_rate_limit()
-                logger.info(f"开始处理： {repo.full_name}")
+                logger.info("开始处理： %s", repo.full_name)
                 
                 # 过滤项目（根据PRD要求）
-                if self._is_valid_project(repo):
+                if self._is_valid_project(repo, min_stars, min_forks):
                     count += 1
                     logger.info(f"找到符合条件的项目 #{count}: {repo.full_name}")
                     # 缓存仓库对象
@@ -107,25 +147,27 @@ class GitHubAPI:
                     yield repo
                 
                 # 达到最大项目数时停止
-                if count >= config.MAX_PROJECTS:
-                    logger.info(f"已达到最大项目数 {config.MAX_PROJECTS}，停止搜索")
+                if count >= max_projects:
+                    logger.info(f"已达到最大项目数 {max_projects}，停止搜索")
                     break
                 
         except GithubException as e:
             logger.error(f"搜索项目时发生错误: {e}")
             raise
     
-    def _is_valid_project(self, repo):
+    def _is_valid_project(self, repo, min_stars, min_forks):
         """验证项目是否符合条件
         
         Args:
             repo: GitHub仓库对象
+            min_stars: 最小星标数
+            min_forks: 最小Fork数
             
         Returns:
             bool: 是否符合条件
         """
         # 检查星标数和Fork数
-        if repo.stargazers_count < config.MIN_STARS or repo.forks_count < config.MIN_FORKS:
+        if repo.stargazers_count < min_stars or repo.forks_count < min_forks:
             return False
         
         # 不再检查提交次数，直接返回True
@@ -148,6 +190,41 @@ class GitHubAPI:
             logger.error(f"获取项目 {repo.full_name} 语言信息时出错: {e}")
             return {}
     
+    def get_repo_summary(self, repo):
+        """并发获取项目的语言和主题标签信息
+        
+        两个请求之间没有数据依赖，通过线程池同时发出以减少等待网络往返的时间；
+        每个请求在共享信号量的限制下执行，多个线程同时采集时并发请求数也不超过MAX_CONCURRENT_REQUESTS。
+        贡献者不在此获取：采集器从2025年以来的提交记录中获取贡献者，额外请求贡献者第一页只会多消耗一次API请求。
+        
+        Args:
+            repo: GitHub仓库对象
+            
+        Returns:
+            dict: 包含languages（语言名称到字节数的映射）和topics（主题标签列表）
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_REQUESTS, thread_name_prefix='github_api')
+        
+        futures = {
+            'languages': self.executor.submit(self._call_limited, self.get_project_languages, repo),
+            'topics': self.executor.submit(self._call_limited, self.get_project_topics, repo)
+        }
+        return {key: future.result() for key, future in futures.items()}
+    
+    def _call_limited(self, func, *args):
+        """在共享信号量的限制下调用API方法
+        
+        Args:
+            func: API方法
+            *args: 方法参数
+            
+        Returns:
+            API方法的返回值
+        """
+        with self._request_semaphore:
+            return func(*args)
+    
     def get_contributor_details(self, username):
         """获取贡献者详细信息
         
@@ -338,9 +415,13 @@ class GitHubAPI:
             
             count = 0
             for pr in pulls_generator:
-                # 如果指定了起始日期，再次过滤确保PR创建时间在起始日期之后
-                if since_date and pr.created_at < since_date:
-                    break  # 由于按更新时间降序排序，一旦找到早于起始日期的PR，后续PR也会更早，可以停止迭代
+                if since_date:
+                    # 由于按更新时间降序排序，一旦更新时间早于起始日期，后续PR也会更早，可以停止迭代
+                    if self._pr_cutoff(pr, since_date):
+                        break
+                    # 旧PR可能在起始日期之后被更新，跳过创建时间早于起始日期的PR
+                    if pr.created_at < since_date:
+                        continue
                 
                 yield pr
                 count += 1
@@ -358,6 +439,19 @@ class GitHubAPI:
             logger.error(f"获取项目 {repo.full_name} PR记录时出错: {e}")
             return
     
+    @staticmethod
+    def _pr_cutoff(pr, since_date):
+        """判断按更新时间降序遍历PR时是否可以停止
+        
+        Args:
+            pr: GitHub PR对象
+            since_date: 起始日期
+            
+        Returns:
+            bool: PR更新时间早于起始日期时返回True
+        """
+        return pr.updated_at < since_date
+    
     def _cache_repo(self, repo):
         """缓存仓库对象
         
@@ -368,5 +462,24 @@ class GitHubAPI:
             self.repo_cache[repo.id] = (repo, time.time())
 
 
-# 创建全局GitHub API实例
-github_api = GitHubAPI()
\ No newline at end of file
+
+# 全局GitHub API实例，首次通过get_github_api获取时创建
+_github_api = None
+_github_api_lock = threading.Lock()
+
+
+def get_github_api():
+    """获取全局GitHub API实例，首次调用时创建
+    
+    导入本模块时不再创建实例；使用方在不再需要时调用close()（或使用with语句）释放HTTP连接池，
+    关闭后的实例再次调用API方法时会重新认证。
+    
+    Returns:
+        GitHubAPI: 全局GitHub API实例
+    """
+    global _github_api
+    if _github_api is None:
+        with _github_api_lock:
+            if _github_api is None:
+                _github_api = GitHubAPI()
+    return _github_api
\ No newline at end of file
@@ -1,19 +1,100 @@
-import pandas as pd
-import numpy as np
+import glob
+import hashlib
+import heapq
+import json
 import logging
+import math
+import os
+import re
+import tempfile
+import time
 from collections import Counter
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from decimal import Decimal
 from src.utils.database import db_manager
 from src.utils.logger import data_processing_logger
 from src.utils.config import config
 
 logger = data_processing_logger
 
+# 简单的性别名字模式（仅供示例，实际应用中可以使用更复杂的算法或API）
+FEMALE_NAME_PATTERNS = ['anna', 'emma', 'sarah', 'jessica', 'maria', 'lisa', 'nina']
+MALE_NAME_PATTERNS = ['john', 'alex', 'michael', 'david', 'james', 'robert', 'tom']
+
+# 预定义的领域关键词（简化版）
+DOMAIN_KEYWORDS = {
+    'web': ['web', 'website', 'frontend', 'backend', 'server', 'client'],
+    'mobile': ['mobile', 'android', 'ios', 'phone', 'tablet', 'app'],
+    'machine learning': ['ml', 'ai', 'machine learning', 'deep learning', 'neural', 'nlp'],
+    'data science': ['data', 'analytics', 'visualization', 'statistics', 'big data'],
+    'devops': ['devops', 'docker', 'kubernetes', 'ci/cd', 'automation', 'cloud'],
+    'security': ['security', 'cryptography', 'auth', 'authentication', 'encryption'],
+    'game': ['game', 'gaming', 'unity', 'unreal', '3d', 'graphics'],
+    'tools': ['tool', 'utility', 'cli', 'command line', 'editor', 'ide']
+}
+
+# 分桶规则：(各桶下界, 各桶标签)，下界交给MySQL的INTERVAL()二分查找得到桶序号，标签按桶序号排列
+# 项目年龄按"已过天数/365.25"计算，因此以年为单位的边界换算为天数下界：天数 < 年数*365.25 即 天数 < ceil(年数*365.25)
+PROJECT_AGE_BUCKETS = (
+    tuple(math.ceil(years * 365.25) for years in (1, 2, 3, 5)),
+    ('0-1年', '1-2年', '2-3年', '3-5年', '5年以上')
+)
+ACTIVITY_BUCKETS = ((51, 201, 501), ('低活跃', '一般', '活跃', '非常活跃'))
+CONTRIBUTOR_BUCKETS = ((11, 21, 51, 101), ('少于10贡献者', '10-20 贡献者', '20-50 贡献者', '50-100 贡献者', '100+ 贡献者'))
+ISSUES_BUCKETS = ((51, 101, 501, 1001), ('少于50 issues', '50-100 issues', '100-500 issues', '500-1000 issues', '1000+ issues'))
+
+# 计算源数据指纹的统计值（_get_data_counts的返回字段），按此顺序参与摘要
+DATA_FINGERPRINT_KEYS = (
+    'total_projects', 'total_contributors', 'total_commits', 'last_updated', 'total_languages', 'total_topics'
+)
+
+def _bucket_index_sql(expression, bounds):
+    """生成计算桶序号的SQL表达式，表达式只求值一次；NULL（INTERVAL返回-1）归入第0个桶"""
+    return f"GREATEST(INTERVAL({expression}, {', '.join(map(str, bounds))}), 0)"
+
+def _encode_cache_value(value):
+    """json.dump的default钩子：将查询结果中的Decimal和日期时间编码为带类型标记的对象，读取缓存时原样还原"""
+    if isinstance(value, Decimal):
+        return {'__decimal__': str(value)}
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, date):
+        return {'__date__': value.isoformat()}
+    raise TypeError(f"无法序列化的类型: {type(value).__name__}")
+
+def _decode_cache_value(obj):
+    """json.load的object_hook：还原_encode_cache_value编码的值"""
+    if len(obj) == 1:
+        if '__decimal__' in obj:
+            return Decimal(obj['__decimal__'])
+        if '__datetime__' in obj:
+            return datetime.fromisoformat(obj['__datetime__'])
+        if '__date__' in obj:
+            return date.fromisoformat(obj['__date__'])
+    return obj
+
+def _compile_alternation(patterns):
+    """将关键词列表编译为单个正则交替式，一次扫描即可判断是否命中任一关键词"""
+    return re.compile('|'.join(map(re.escape, patterns)))
+
 class DataAnalyzer:
     """GitHub数据分析师"""
     
     def __init__(self):
         self.db_manager = db_manager
+        # 综合分析结果的磁盘缓存目录，文件名包含源数据指纹，供多次运行之间复用
+        self.cache_dir = os.path.join(config.CACHE_DIR, 'analysis')
+        # 缓存TTL，单位秒（按缓存文件的修改时间计算）
+        self.cache_ttl = 3600  # 缓存1小时
+        # 关键词匹配用的正则只在初始化时编译一次，各次分析直接复用
+        self.female_name_regex = _compile_alternation(FEMALE_NAME_PATTERNS)
+        self.male_name_regex = _compile_alternation(MALE_NAME_PATTERNS)
+        # 领域关键词交替式交给数据库的REGEXP_LIKE匹配
+        self.domain_patterns = {
+            domain: '|'.join(map(re.escape, keywords))
+            for domain, keywords in DOMAIN_KEYWORDS.items()
+        }
     
     def initialize_analysis(self):
         """初始化数据分析过程"""
@@ -29,6 +110,109 @@ class DataAnalyzer:
         
         logger.info("数据分析初始化完成")
     
+    def refresh_summary_tables(self, fingerprint=None):
+        """刷新预计算的汇总表
+        
+        在数据采集完成后调用，将语言统计写入mv_language_stats、描述领域计数写入mv_domain_counts，
+        之后的分析直接读取汇总表，无需重复全表扫描。
+        
+        Args:
+            fingerprint: 当前源数据的指纹，为None时重新计算；与汇总表一起记录到mv_refresh_log
+        """
+        logger.info("开始刷新汇总表...")
+        
+        try:
+            if fingerprint is None:
+                fingerprint = self._data_fingerprint(self._get_data_counts())
+            
+            # 清空与重新写入在同一事务中完成，读取方不会看到空表
+            with self.db_manager.get_cursor() as cursor:
+                cursor.execute("DELETE FROM mv_language_stats")
+                cursor.execute("""
+                INSERT INTO mv_language_stats
+                    (language_name, project_count, total_percentage, avg_stars, avg_forks, refreshed_at)
+                SELECT l.language_name, COUNT(DISTINCT l.project_id),
+                       SUM(l.percentage),
+                       AVG(p.stargazers_count),
+                       AVG(p.forks_count),
+                       NOW()
+                FROM languages l
+                JOIN projects p ON l.project_id = p.id
+                GROUP BY l.language_name
+                """)
+                language_count = cursor.rowcount
+                
+                domain_counts = self._count_domain_keywords(cursor)
+                cursor.execute("DELETE FROM mv_domain_counts")
+                cursor.executemany(
+                    "INSERT INTO mv_domain_counts (domain, project_count, refreshed_at) VALUES (%s, %s, NOW())",
+                    list(domain_counts.items())
+                )
+                
+                # 记录刷新时间和源数据指纹，即使两张汇总表都没有数据也能知道已经刷新过
+                cursor.execute("""
+                INSERT INTO mv_refresh_log (id, refreshed_at, fingerprint) VALUES (1, NOW(), %s)
+                ON DUPLICATE KEY UPDATE refreshed_at = VALUES(refreshed_at), fingerprint = VALUES(fingerprint)
+                """, (fingerprint,))
+            
+            logger.info(f"汇总表刷新完成，共 {language_count} 种编程语言，{len(domain_counts)} 个领域")
+        except Exception as e:
+            logger.error(f"刷新汇总表时出错: {e}")
+            raise
+    
+    def _get_data_counts(self):
+        """获取各表的统计值，用于综合分析的元数据和判断数据是否变化
+        
+        Returns:
+            dict: 项目总数、贡献者总数、总提交数、项目最近更新时间、语言和话题记录数
+        """
+        query = """
+        SELECT (SELECT COUNT(*) FROM projects) as total_projects,
+               (SELECT COUNT(*) FROM contributors) as total_contributors,
+               (SELECT COALESCE(SUM(total_commits), 0) FROM statistics) as total_commits,
+               (SELECT MAX(updated_at) FROM projects) as last_updated,
+               (SELECT COUNT(*) FROM languages) as total_languages,
+               (SELECT COUNT(*) FROM topics) as total_topics
+        """
+        return self.db_manager.execute_query(query)[0]
+    
+    @staticmethod
+    def _data_fingerprint(counts):
+        """根据各表统计值计算源数据指纹，任一统计值变化时指纹随之变化
+        
+        Args:
+            counts: _get_data_counts的返回值
+            
+        Returns:
+            str: 40位十六进制SHA-1摘要
+        """
+        values = tuple(counts[key] for key in DATA_FINGERPRINT_KEYS)
+        return hashlib.sha1(repr(values).encode('utf-8')).hexdigest()
+    
+    def _get_summary_refresh_state(self):
+        """获取汇总表最近一次刷新的记录，从未刷新过时返回None
+        
+        Returns:
+            dict: 包含refreshed_at和fingerprint
+        """
+        rows = self.db_manager.execute_query("SELECT refreshed_at, fingerprint FROM mv_refresh_log WHERE id = 1")
+        return rows[0] if rows else None
+    
+    def _ensure_summary_tables(self, fingerprint):
+        """汇总表从未刷新过或刷新后源数据已变化时，先刷新汇总表
+        
+        以刷新记录中的源数据指纹而不是汇总表是否为空作为判断依据：languages等源表没有数据时，
+        汇总表刷新后仍然为空，不应在每次分析时都重新刷新；采集未经collect_data（或刷新失败）时，
+        指纹不一致同样会触发刷新。
+        
+        Args:
+            fingerprint: 当前源数据的指纹
+        """
+        state = self._get_summary_refresh_state()
+        if state is None or state['fingerprint'] != fingerprint:
+            logger.info("源数据已变化，汇总表需要刷新")
+            self.refresh_summary_tables(fingerprint)
+    
     def analyze_programming_languages(self):
         """分析编程语言分布（使用迭代器优化）
         
@@ -38,67 +222,50 @@ class DataAnalyzer:
         logger.info("开始分析编程语言分布...")
         
         try:
-            # 获取所有项目的语言信息
+            # 从预计算的汇总表读取各语言的项目数、平均星标数和平均Fork数，
+            # 总项目数由窗口函数在同一查询中计算
             query = """
-            SELECT l.language_name, COUNT(DISTINCT l.project_id) as project_count,
-                   SUM(l.percentage) as total_percentage
-            FROM languages l
-            GROUP BY l.language_name
+            SELECT language_name, project_count, total_percentage, avg_stars, avg_forks,
+                   SUM(project_count) OVER () as total_projects
+            FROM mv_language_stats
             ORDER BY project_count DESC
             """
             
             language_data = self.db_manager.execute_query(query)
             
-            # 计算总项目数
-            total_projects = sum(item['project_count'] for item in language_data)
+            # 每行都带有相同的总项目数
+            total_projects = int(language_data[0]['total_projects']) if language_data else 0
             
-            # 计算百分比并构建结果，使用迭代器而不是创建DataFrame
-            top_languages = []
-            for i, item in enumerate(language_data):
-                if i >= 10:  # 只取前10个
-                    break
-                
-                item_with_percentage = {
+            # 只取前10个语言构建结果；占比用浮点数计算，SQL的DECIMAL除法只保留有限位小数
+            top_languages = [
+                {
                     'language_name': item['language_name'],
                     'project_count': item['project_count'],
                     'total_percentage': item['total_percentage'],
                     'percentage': (item['project_count'] / total_projects) * 100 if total_projects > 0 else 0
                 }
-                top_languages.append(item_with_percentage)
-            
-            # 获取各语言的平均星标数
-            query = """
-            SELECT l.language_name, AVG(p.stargazers_count) as avg_stars
-            FROM languages l
-            JOIN projects p ON l.project_id = p.id
-            GROUP BY l.language_name
-            ORDER BY avg_stars DESC
-            LIMIT 10
-            """
-            
-            stars_data = self.db_manager.execute_query(query)
-            
-            # 获取各语言的平均Fork数
-            query = """
-            SELECT l.language_name, AVG(p.forks_count) as avg_forks
-            FROM languages l
-            JOIN projects p ON l.project_id = p.id
-            GROUP BY l.language_name
-            ORDER BY avg_forks DESC
-            LIMIT 10
-            """
+                for item in language_data[:10]
+            ]
             
-            forks_data = self.db_manager.execute_query(query)
+            # 从同一结果集中分别取平均星标数和平均Fork数最高的前10种语言
+            stars_data = [
+                {'language_name': item['language_name'], 'avg_stars': item['avg_stars']}
+                for item in heapq.nlargest(10, language_data, key=lambda item: item['avg_stars'] or 0)
+            ]
+            forks_data = [
+                {'language_name': item['language_name'], 'avg_forks': item['avg_forks']}
+                for item in heapq.nlargest(10, language_data, key=lambda item: item['avg_forks'] or 0)
+            ]
             
             result = {
                 'top_languages': top_languages,
                 'languages_by_stars': stars_data,
                 'languages_by_forks': forks_data,
                 'total_projects': total_projects,
-                'total_languages': len(df)
+                'total_languages': len(language_data)
             }
             
-            logger.info(f"编程语言分析完成，发现 {len(df)} 种不同的编程语言")
+            logger.info(f"编程语言分析完成，发现 {len(language_data)} 种不同的编程语言")
             return result
             
         except Exception as e:
@@ -151,36 +318,31 @@ class DataAnalyzer:
             
             active_contributors = self.db_manager.execute_query(query)
             
-            # 估算贡献者年龄（基于账号创建时间）
+            # 估算贡献者年龄（基于账号创建时间），账号年龄直接在SQL中计算
             query = """
-            SELECT YEAR(created_at) as create_year, COUNT(*) as contributor_count
+            SELECT YEAR(NOW()) - YEAR(created_at) + 1 as account_age, COUNT(*) as contributor_count
             FROM contributors
             WHERE created_at IS NOT NULL
-            GROUP BY create_year
-            ORDER BY create_year
+            GROUP BY account_age
+            ORDER BY account_age DESC
             """
             
             age_data = self.db_manager.execute_query(query)
             
             # 分析贡献者创建时间分布
-            current_year = datetime.now().year
-            account_ages = []
-            for item in age_data:
-                if item['create_year']:
-                    account_age = current_year - item['create_year'] + 1
-                    account_ages.append({
-                        'age_group': f"{account_age}年",
-                        'count': item['contributor_count']
-                    })
-            
-            # 贡献者性别推测（基于用户名，简单规则）
+            account_ages = [
+                {'age_group': f"{item['account_age']}年", 'count': item['contributor_count']}
+                for item in age_data
+            ]
+            
+            # 贡献者性别推测（基于用户名，简单规则），用户名在SQL中统一转换为小写
             query = """
-            SELECT username
+            SELECT LOWER(username)
             FROM contributors
             LIMIT 1000
             """
             
-            usernames = self.db_manager.execute_query(query)
+            usernames = self.db_manager.execute_query_column(query)
             gender_distribution = self._estimate_gender(usernames)
             
             result = {
@@ -202,23 +364,21 @@ class DataAnalyzer:
         """基于用户名简单估算性别分布
         
         Args:
-            usernames: 用户名列表
+            usernames: 小写的用户名列表
             
         Returns:
             dict: 性别分布估计
         """
-        # 简单的性别名字模式（仅供示例，实际应用中可以使用更复杂的算法或API）
-        female_patterns = ['anna', 'emma', 'sarah', 'jessica', 'maria', 'lisa', 'nina']
-        male_patterns = ['john', 'alex', 'michael', 'david', 'james', 'robert', 'tom']
+        female_regex = self.female_name_regex
+        male_regex = self.male_name_regex
         
         male_count = 0
         female_count = 0
         unknown_count = 0
         
-        for item in usernames:
-            username = item['username'].lower()
-            is_female = any(pattern in username for pattern in female_patterns)
-            is_male = any(pattern in username for pattern in male_patterns)
+        for username in usernames:
+            is_female = female_regex.search(username) is not None
+            is_male = male_regex.search(username) is not None
             
             if is_female and not is_male:
                 female_count += 1
@@ -233,15 +393,23 @@ class DataAnalyzer:
             {'gender': '未知', 'count': unknown_count}
         ]
     
-    def analyze_project_domains(self):
+    def analyze_project_domains(self, ensure_summary=True):
         """分析项目领域分类
         
+        Args:
+            ensure_summary: 是否先按源数据指纹检查并刷新汇总表（mv_domain_counts、mv_language_stats）；
+                            generate_analysis_summary已在并发分析前检查过，传入False
+        
         Returns:
             dict: 包含项目领域分析结果的数据
         """
         logger.info("开始分析项目领域分类...")
         
         try:
+            # 单独调用时汇总表可能早于最近一次采集，数据已变化时先刷新
+            if ensure_summary:
+                self._ensure_summary_tables(self._data_fingerprint(self._get_data_counts()))
+            
             # 基于主题标签分析领域分布
             query = """
             SELECT t.topic_name, COUNT(*) as project_count
@@ -253,12 +421,10 @@ class DataAnalyzer:
             
             topic_data = self.db_manager.execute_query(query)
             
-            # 基于语言分析领域趋势
+            # 基于语言分析领域趋势，与编程语言分析共用预计算的汇总表，不再重复聚合languages
             query = """
-            SELECT l.language_name, COUNT(*) as project_count
-            FROM languages l
-            JOIN projects p ON l.project_id = p.id
-            GROUP BY l.language_name
+            SELECT language_name, project_count
+            FROM mv_language_stats
             ORDER BY project_count DESC
             LIMIT 15
             """
@@ -278,14 +444,7 @@ class DataAnalyzer:
             license_data = self.db_manager.execute_query(query)
             
             # 基于描述的领域分类（简化版）
-            query = """
-            SELECT description
-            FROM projects
-            WHERE description IS NOT NULL AND description != ''
-            """
-            
-            descriptions = self.db_manager.execute_query(query)
-            domain_keywords = self._extract_domain_keywords(descriptions)
+            domain_keywords = self._extract_domain_keywords()
             
             result = {
                 'top_topics': topic_data,
@@ -301,51 +460,51 @@ class DataAnalyzer:
             logger.error(f"分析项目领域分类时出错: {e}")
             raise
     
-    def _extract_domain_keywords(self, descriptions):
-        """从项目描述中提取领域关键词（优化版，减少内存使用）
+    def _count_domain_keywords(self, cursor):
+        """统计项目描述中各领域关键词命中的项目数
+        
+        在数据库中一次扫描项目描述，按领域分别用正则计数（不区分大小写，每个描述对每个领域只计数一次），
+        只返回各领域的计数，无需把描述传输到客户端。
         
         Args:
-            descriptions: 项目描述列表
+            cursor: 数据库游标
             
         Returns:
-            list: 关键词分布
+            dict: 领域到项目数的映射
         """
-        # 预定义的领域关键词（简化版）
-        domain_keywords = {
-            'web': ['web', 'website', 'frontend', 'backend', 'server', 'client'],
-            'mobile': ['mobile', 'android', 'ios', 'phone', 'tablet', 'app'],
-            'machine learning': ['ml', 'ai', 'machine learning', 'deep learning', 'neural', 'nlp'],
-            'data science': ['data', 'analytics', 'visualization', 'statistics', 'big data'],
-            'devops': ['devops', 'docker', 'kubernetes', 'ci/cd', 'automation', 'cloud'],
-            'security': ['security', 'cryptography', 'auth', 'authentication', 'encryption'],
-            'game': ['game', 'gaming', 'unity', 'unreal', '3d', 'graphics'],
-            'tools': ['tool', 'utility', 'cli', 'command line', 'editor', 'ide']
-        }
+        domains = list(self.domain_patterns)
+        columns = ',\n                   '.join(
+            f"SUM(REGEXP_LIKE(description, %s, 'i')) as domain_{i}" for i in range(len(domains))
+        )
+        query = f"""
+            SELECT {columns}
+            FROM projects
+            WHERE description IS NOT NULL AND description != ''
+            """
+        
+        cursor.execute(query, [self.domain_patterns[domain] for domain in domains])
+        row = cursor.fetchone()
+        return {domain: int(row[f'domain_{i}'] or 0) for i, domain in enumerate(domains)}
+    
+    def _extract_domain_keywords(self):
+        """从预计算的汇总表读取领域关键词分布
         
-        # 使用生成器函数处理描述，避免一次性处理所有数据
-        def process_description(desc_item):
-            if desc_item['description']:
-                desc_lower = desc_item['description'].lower()
-                for domain, keywords in domain_keywords.items():
-                    for keyword in keywords:
-                        if keyword in desc_lower:
-                            yield domain
-                            break  # 每个描述对每个领域只计数一次
-        
-        domain_counts = {domain: 0 for domain in domain_keywords.keys()}
-        
-        # 处理描述并统计
-        for domain in (d for desc in descriptions for d in process_description(desc)):
-            domain_counts[domain] += 1
-        
-        # 转换为排序后的列表
-        sorted_domains = sorted(
-            [{'domain': domain, 'count': count} for domain, count in domain_counts.items()],
+        Returns:
+            list: 按项目数降序排列的关键词分布
+        """
+        query = """
+        SELECT domain, project_count
+        FROM mv_domain_counts
+        """
+        
+        domain_counts = {item['domain']: item['project_count'] for item in self.db_manager.execute_query(query)}
+        
+        # 按项目数降序排列，数量相同的领域保持DOMAIN_KEYWORDS中的顺序（排序是稳定的）
+        return sorted(
+            [{'domain': domain, 'count': domain_counts.get(domain, 0)} for domain in DOMAIN_KEYWORDS],
             key=lambda x: x['count'],
             reverse=True
         )
-        
-        return sorted_domains
     
     def analyze_project_lifecycle(self):
         """分析项目生命周期
@@ -356,52 +515,57 @@ class DataAnalyzer:
         logger.info("开始分析项目生命周期...")
         
         try:
-            # 分析项目创建时间分布
+            # 一次查询同时获取项目创建时间分布和更新活跃度（按已建索引的生成列分组，无需逐行格式化日期）
             query = """
-            SELECT DATE_FORMAT(created_at, '%Y-%m') as month, COUNT(*) as project_count
+            SELECT 'created' as kind, created_month as month, COUNT(*) as project_count
             FROM projects
-            GROUP BY month
-            ORDER BY month
-            """
-            
-            creation_data = self.db_manager.execute_query(query)
-            
-            # 分析项目更新活跃度
-            query = """
-            SELECT DATE_FORMAT(updated_at, '%Y-%m') as month, COUNT(*) as updated_count
+            GROUP BY created_month
+            UNION ALL
+            SELECT 'updated' as kind, updated_month as month, COUNT(*) as project_count
             FROM projects
-            GROUP BY month
-            ORDER BY month
+            GROUP BY updated_month
+            ORDER BY kind, month
             """
             
-            update_data = self.db_manager.execute_query(query)
+            creation_data = []
+            update_data = []
+            for item in self.db_manager.execute_query(query):
+                if item['kind'] == 'created':
+                    creation_data.append({'month': item['month'], 'project_count': item['project_count']})
+                else:
+                    update_data.append({'month': item['month'], 'updated_count': item['project_count']})
             
-            # 分析项目年龄分布
-            current_date = datetime.now()
-            query = """
-            SELECT created_at
+            # 分析项目年龄分布，直接在SQL中分桶，只返回各区间的计数
+            age_bounds, age_labels = PROJECT_AGE_BUCKETS
+            query = f"""
+            SELECT {_bucket_index_sql('TIMESTAMPDIFF(DAY, created_at, NOW())', age_bounds)} as bucket,
+                   COUNT(*) as project_count
             FROM projects
             WHERE created_at IS NOT NULL
+            GROUP BY bucket
             """
             
-            all_projects = self.db_manager.execute_query(query)
-            age_distribution = self._calculate_project_age_distribution(all_projects, current_date)
+            age_counts = {item['bucket']: item['project_count'] for item in self.db_manager.execute_query(query)}
+            # 按固定顺序输出所有区间，没有项目的区间计数为0
+            age_distribution = [
+                {'range': age_range, 'count': age_counts.get(bucket, 0)}
+                for bucket, age_range in enumerate(age_labels)
+            ]
             
             # 分析项目活跃度（基于提交次数）
-            query = """
-            SELECT 
-                CASE 
-                    WHEN s.total_commits > 500 THEN '非常活跃'
-                    WHEN s.total_commits > 200 THEN '活跃'
-                    WHEN s.total_commits > 50 THEN '一般'
-                    ELSE '低活跃'
-                END as activity_level,
-                COUNT(*) as project_count
+            activity_bounds, activity_labels = ACTIVITY_BUCKETS
+            query = f"""
+            SELECT {_bucket_index_sql('s.total_commits', activity_bounds)} as bucket,
+                   COUNT(*) as project_count
             FROM statistics s
-            GROUP BY activity_level
+            GROUP BY bucket
+            ORDER BY bucket
             """
             
-            activity_data = self.db_manager.execute_query(query)
+            activity_data = [
+                {'activity_level': activity_labels[item['bucket']], 'project_count': item['project_count']}
+                for item in self.db_manager.execute_query(query)
+            ]
             
             result = {
                 'creation_trend': creation_data,
@@ -417,46 +581,6 @@ class DataAnalyzer:
             logger.error(f"分析项目生命周期时出错: {e}")
             raise
     
-    def _calculate_project_age_distribution(self, projects, current_date):
-        """计算项目年龄分布
-        
-        Args:
-            projects: 项目列表
-            current_date: 当前日期
-            
-        Returns:
-            list: 年龄分布
-        """
-        age_ranges = {
-            '0-1年': 0,
-            '1-2年': 0,
-            '2-3年': 0,
-            '3-5年': 0,
-            '5年以上': 0
-        }
-        
-        for project in projects:
-            if project['created_at']:
-                created_date = project['created_at']
-                if isinstance(created_date, str):
-                    created_date = datetime.strptime(created_date, '%Y-%m-%d %H:%M:%S')
-                
-                age_days = (current_date - created_date).days
-                age_years = age_days / 365.25
-                
-                if age_years < 1:
-                    age_ranges['0-1年'] += 1
-                elif age_years < 2:
-                    age_ranges['1-2年'] += 1
-                elif age_years < 3:
-                    age_ranges['2-3年'] += 1
-                elif age_years < 5:
-                    age_ranges['3-5年'] += 1
-                else:
-                    age_ranges['5年以上'] += 1
-        
-        return [{'range': age_range, 'count': count} for age_range, count in age_ranges.items()]
-    
     def analyze_community_health(self):
         """分析社区健康度
         
@@ -466,48 +590,50 @@ class DataAnalyzer:
         logger.info("开始分析社区健康度...")
         
         try:
-            # 分析项目贡献者数量分布
-            query = """
-            SELECT 
-                CASE 
-                    WHEN contributors_count > 100 THEN '100+ 贡献者'
-                    WHEN contributors_count > 50 THEN '50-100 贡献者'
-                    WHEN contributors_count > 20 THEN '20-50 贡献者'
-                    WHEN contributors_count > 10 THEN '10-20 贡献者'
-                    ELSE '少于10贡献者'
-                END as contributor_range,
-                COUNT(*) as project_count
+            # 一次扫描同时计算贡献者数量分布和讨论活跃度分布（按两个区间交叉分组）
+            contributor_bounds, contributor_labels = CONTRIBUTOR_BUCKETS
+            issues_bounds, issues_labels = ISSUES_BUCKETS
+            query = f"""
+            SELECT {_bucket_index_sql('contributors_count', contributor_bounds)} as contributor_bucket,
+                   {_bucket_index_sql('open_issues_count', issues_bounds)} as issues_bucket,
+                   COUNT(*) as project_count
             FROM projects
-            GROUP BY contributor_range
+            GROUP BY contributor_bucket, issues_bucket
             """
             
-            contributor_dist = self.db_manager.execute_query(query)
+            # 在Python中分别汇总两个维度的计数（交叉分组最多25行）
+            contributor_counts = Counter()
+            issues_counts = Counter()
+            for item in self.db_manager.execute_query(query):
+                contributor_counts[item['contributor_bucket']] += item['project_count']
+                issues_counts[item['issues_bucket']] += item['project_count']
             
-            # 分析星标数与Fork数的相关性
-            query = """
-            SELECT stargazers_count, forks_count
-            FROM projects
-            """
-            
-            stars_forks_data = self.db_manager.execute_query(query)
-            correlation = self._calculate_correlation(stars_forks_data, 'stargazers_count', 'forks_count')
+            # 分析项目贡献者数量分布
+            contributor_dist = [
+                {'contributor_range': contributor_labels[bucket], 'project_count': count}
+                for bucket, count in sorted(contributor_counts.items())
+            ]
             
             # 分析项目讨论活跃度
+            issues_dist = [
+                {'issues_range': issues_labels[bucket], 'project_count': count}
+                for bucket, count in sorted(issues_counts.items())
+            ]
+            
+            # 分析星标数与Fork数的相关性，由数据库汇总计算所需的各项和，只返回一行
             query = """
-            SELECT 
-                CASE 
-                    WHEN open_issues_count > 1000 THEN '1000+ issues'
-                    WHEN open_issues_count > 500 THEN '500-1000 issues'
-                    WHEN open_issues_count > 100 THEN '100-500 issues'
-                    WHEN open_issues_count > 50 THEN '50-100 issues'
-                    ELSE '少于50 issues'
-                END as issues_range,
-                COUNT(*) as project_count
+            SELECT COUNT(*) as n,
+                   SUM(stargazers_count) as sx,
+                   SUM(forks_count) as sy,
+                   SUM(stargazers_count * forks_count) as sxy,
+                   SUM(stargazers_count * stargazers_count) as sxx,
+                   SUM(forks_count * forks_count) as syy
             FROM projects
-            GROUP BY issues_range
+            WHERE stargazers_count IS NOT NULL AND forks_count IS NOT NULL
             """
             
-            issues_dist = self.db_manager.execute_query(query)
+            sums = self.db_manager.execute_query(query)[0]
+            correlation = self._correlation_from_sums(sums)
             
             result = {
                 'contributor_distribution': contributor_dist,
@@ -522,24 +648,101 @@ class DataAnalyzer:
             logger.error(f"分析社区健康度时出错: {e}")
             raise
     
-    def _calculate_correlation(self, data, column1, column2):
-        """计算两个列之间的相关性
+    def _correlation_from_sums(self, sums):
+        """根据数据库汇总的各项和计算皮尔逊相关系数
         
         Args:
-            data: 数据列表
-            column1: 第一列名称
-            column2: 第二列名称
+            sums: 包含n、sx、sy、sxy、sxx、syy的字典
             
         Returns:
             float: 相关系数
         """
-        if not data:
+        n = int(sums['n'] or 0)
+        if n < 2:
             return 0
         
-        df = pd.DataFrame(data)
-        # 计算皮尔逊相关系数
-        correlation = df[column1].corr(df[column2])
-        return float(correlation) if not np.isnan(correlation) else 0
+        # 数据库返回的和为整数（DECIMAL），先用整数精确计算分子分母，避免大数相减的精度损失
+        sx, sy, sxy, sxx, syy = (int(sums[key] or 0) for key in ('sx', 'sy', 'sxy', 'sxx', 'syy'))
+        numerator = n * sxy - sx * sy
+        denominator = math.sqrt((n * sxx - sx * sx) * (n * syy - sy * sy))
+        return float(numerator / denominator) if denominator else 0
+    
+    def clear_cache(self):
+        """删除磁盘上的全部综合分析结果缓存"""
+        for cache_path in glob.glob(os.path.join(self.cache_dir, 'summary_*.json')):
+            try:
+                os.remove(cache_path)
+            except OSError as e:
+                logger.warning(f"删除分析结果缓存 {cache_path} 失败: {e}")
+        logger.info("分析结果缓存已清空")
+    
+    def _summary_cache_path(self, fingerprint):
+        """源数据指纹对应的综合分析结果缓存文件路径"""
+        return os.path.join(self.cache_dir, f"summary_{fingerprint}.json")
+    
+    def _load_cached_summary(self, fingerprint):
+        """读取未过期的综合分析结果缓存
+        
+        Args:
+            fingerprint: 源数据指纹
+            
+        Returns:
+            dict: 缓存的综合分析结果，缓存不存在、已过期或无法读取时返回None
+        """
+        cache_path = self._summary_cache_path(fingerprint)
+        try:
+            if time.time() - os.path.getmtime(cache_path) >= self.cache_ttl:
+                return None
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f, object_hook=_decode_cache_value)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取分析结果缓存 {cache_path} 失败: {e}")
+            return None
+    
+    def _save_cached_summary(self, fingerprint, summary):
+        """保存综合分析结果缓存，并删除其他数据版本的缓存
+        
+        Args:
+            fingerprint: 源数据指纹
+            summary: 综合分析结果
+        """
+        cache_path = self._summary_cache_path(fingerprint)
+        temp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # 先写同目录下的临时文件再替换，其他进程不会读到写了一半的缓存
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='summary_', suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False, default=_encode_cache_value)
+            os.replace(temp_path, cache_path)
+            temp_path = None
+            
+            for stale_path in glob.glob(os.path.join(self.cache_dir, 'summary_*.json')):
+                if stale_path != cache_path:
+                    os.remove(stale_path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"保存分析结果缓存 {cache_path} 失败: {e}")
+        finally:
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+    
+    def _run_analysis(self, key, func):
+        """在工作线程中执行单项分析，结束后释放该线程的数据库连接
+        
+        Args:
+            key: 分析项名称
+            func: 分析函数
+            
+        Returns:
+            dict: 分析结果
+        """
+        logger.info(f"正在执行 {key} 分析...")
+        try:
+            return func()
+        finally:
+            self.db_manager.disconnect()
     
     def generate_analysis_summary(self):
         """生成综合分析结果（使用生成器模式优化）
@@ -551,17 +754,23 @@ class DataAnalyzer:
         
         try:
             # 获取统计信息（单独执行，避免与其他分析重叠）
-            # 获取项目总数
-            query = "SELECT COUNT(*) as total_count FROM projects"
-            total_projects = self.db_manager.execute_query(query)[0]['total_count']
+            # 项目总数、贡献者总数、总提交数以及用于判断数据是否变化的其他指标通过一次查询获取
+            counts = self._get_data_counts()
+            total_projects = counts['total_projects']
+            total_contributors = counts['total_contributors']
+            total_commits = counts['total_commits']
+            
+            # 数据版本指纹：各表统计值和项目最近更新时间，任一变化都重新分析
+            cache_key = self._data_fingerprint(counts)
             
-            # 获取贡献者总数
-            query = "SELECT COUNT(*) as total_count FROM contributors"
-            total_contributors = self.db_manager.execute_query(query)[0]['total_count']
+            # 在启动并发分析前准备好共用的汇总表，避免多个线程同时刷新
+            self._ensure_summary_tables(cache_key)
             
-            # 获取总提交数
-            query = "SELECT SUM(total_commits) as total_count FROM statistics"
-            total_commits = self.db_manager.execute_query(query)[0]['total_count'] or 0
+            # 数据未变化且缓存未过期时直接返回缓存结果，每次读取都得到新的对象，调用方可以随意修改
+            cached_summary = self._load_cached_summary(cache_key)
+            if cached_summary is not None:
+                logger.info("数据未发生变化，使用缓存的综合分析结果")
+                return cached_summary
             
             # 初始化结果字典
             summary = {
@@ -573,22 +782,25 @@ class DataAnalyzer:
                 }
             }
             
-            # 使用生成器方式逐个执行分析，避免一次性加载所有结果
+            # 各项分析之间互不依赖，且大部分时间在等待数据库，使用线程池并发执行
             analysis_functions = [
                 ('languages', self.analyze_programming_languages),
                 ('contributors', self.analyze_contributors),
-                ('domains', self.analyze_project_domains),
+                ('domains', lambda: self.analyze_project_domains(ensure_summary=False)),
                 ('lifecycle', self.analyze_project_lifecycle),
                 ('community_health', self.analyze_community_health)
             ]
             
-            for key, func in analysis_functions:
-                logger.info(f"正在执行 {key} 分析...")
-                result = func()
-                summary[key] = result
-                # 减少内存占用
-                if hasattr(result, 'clear'):
-                    result.clear()
+            with ThreadPoolExecutor(max_workers=len(analysis_functions)) as executor:
+                futures = {
+                    key: executor.submit(self._run_analysis, key, func)
+                    for key, func in analysis_functions
+                }
+                for key, future in futures.items():
+                    summary[key] = future.result()
+            
+            # 只保留当前数据版本的缓存，缓存文件中是序列化后的副本，调用方修改返回值不会影响缓存
+            self._save_cached_summary(cache_key, summary)
             
             logger.info(f"综合分析完成: {total_projects} 个项目, {total_contributors} 个贡献者, {total_commits} 次提交")
             return summary
@@ -2,13 +2,233 @@ import pandas as pd
 import numpy as np
 import logging
 import re
+import string
 from datetime import datetime
+from functools import lru_cache
 from src.utils.logger import data_processing_logger
 
 logger = data_processing_logger
 
+# 预编译的正则表达式，避免每次调用时查找编译缓存
+WHITESPACE_RE = re.compile(r'\s+')
+SPECIAL_CHARS_RE = re.compile(r'[^\w\s.,!?-]')
+
+# 纯ASCII文本移除特殊字符用的转换表，与SPECIAL_CHARS_RE在ASCII范围内等价（空白字符已先合并为空格）
+ASCII_SPECIAL_CHARS_TABLE = str.maketrans('', '', ''.join(
+    chr(code) for code in range(128)
+    if chr(code) not in string.ascii_letters + string.digits + '_ .,!?-'
+))
+
+# 公司名称中需要移除的常见前缀和后缀，原实现按以下顺序逐个替换（re.IGNORECASE）：
+# "^@"、"^the\s+"，然后依次是结尾的", Inc."、", LLC."、", Corp."、", GmbH"、", AG"及对应的空格形式。
+# 合并为两个正则，一次匹配即可移除全部可叠加的前缀和后缀：
+# 前缀为"@"和开头的"The"；后缀按文本顺序依次可以是空格形式的AG、GmbH、Corp.、LLC.、Inc.，
+# 再依次是逗号形式的AG、GmbH、Corp.、LLC.、Inc.，每种至多移除一次。开头的前瞻让不以空白或逗号开头的位置立即失败。
+# 原实现中"$"还能匹配末尾换行符之前的位置：逗号形式的后缀紧跟在换行符之后时，移除后名称以换行符结尾，
+# 之后的后缀仍可在该换行符之前被移除，而换行符本身保留。因此逗号形式的后缀前允许一个换行符（捕获后原样放回），
+# 第二个前瞻限制这种换行符至多一个；有两个时（第二次移除后以两个换行符结尾，不再移除）匹配必须从第一个开始。
+COMPANY_PREFIX_RE = re.compile(r'\A@?(?:the\s+)?', re.IGNORECASE)
+COMPANY_SUFFIX_RE = re.compile(
+    r'(?=[\s,])'
+    r'(?=(?:\n,)?(?:(?!\n,)[\s\S])*(?:\n,(?:(?!\n,)[\s\S])*)?\Z)'
+    r'(?:\s+ag)?(?:\s+gmbh)?(?:\s+corp\.?)?(?:\s+llc\.?)?(?:\s+inc\.?)?'
+    r'(?:(\n)?,\s+ag)?(?:(\n)?,\s+gmbh)?(?:(\n)?,\s+corp\.?)?(?:(\n)?,\s+llc\.?)?(?:(\n)?,\s+inc\.?)?\Z',
+    re.IGNORECASE
+)
+# 移除后缀时放回捕获的换行符（未参与匹配的分组替换为空字符串）
+COMPANY_SUFFIX_REPL = r'\1\2\3\4\5'
+
+# 支持的日期时间格式，按尝试顺序排列
+DATETIME_FORMATS = (
+    '%Y-%m-%dT%H:%M:%SZ',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d',
+    '%d/%m/%Y',
+    '%m/%d/%Y',
+)
+
+# 按时间聚合时可以用to_period分组代替resample的频率（倍数为1时）：
+# 天及更短的固定频率，resample以时间段开始时刻标记；周、月、季、年，resample以时间段结束日期标记
+PERIOD_START_LABEL_OFFSETS = (pd.offsets.Tick, pd.offsets.Day)
+PERIOD_END_LABEL_OFFSETS = (pd.offsets.Week, pd.offsets.MonthEnd, pd.offsets.QuarterEnd, pd.offsets.YearEnd)
+
+# 常见的位置标准化映射
+LOCATION_MAPPING = {
+    'usa': 'United States',
+    'us': 'United States',
+    'u.s.a.': 'United States',
+    'uk': 'United Kingdom',
+    'u.k.': 'United Kingdom',
+    'china': 'China',
+    'cina': 'China',
+    'india': 'India',
+    'canada': 'Canada',
+    'germany': 'Germany',
+    'deutschland': 'Germany',
+    'france': 'France',
+    'japan': 'Japan',
+    'italy': 'Italy',
+    'italia': 'Italy',
+    'brazil': 'Brazil',
+    'brasil': 'Brazil',
+    'spain': 'Spain',
+    'españa': 'Spain',
+    'russia': 'Russia',
+    'australia': 'Australia',
+    'switzerland': 'Switzerland',
+    'swiss': 'Switzerland',
+    'netherlands': 'Netherlands',
+    'nl': 'Netherlands',
+    'belgium': 'Belgium',
+    'poland': 'Poland',
+    'polska': 'Poland',
+    'ukraine': 'Ukraine',
+    'sweden': 'Sweden',
+    'sverige': 'Sweden',
+    'norway': 'Norway',
+    'norge': 'Norway',
+    'denmark': 'Denmark',
+    'danmark': 'Denmark',
+    'finland': 'Finland',
+    'suomi': 'Finland',
+    'singapore': 'Singapore',
+    'korea': 'South Korea',
+    'south korea': 'South Korea',
+    'republic of korea': 'South Korea',
+    'mexico': 'Mexico',
+    'argentina': 'Argentina',
+    'chile': 'Chile',
+    'colombia': 'Colombia',
+    'peru': 'Peru',
+    'south africa': 'South Africa',
+    'egypt': 'Egypt',
+    'saudi arabia': 'Saudi Arabia',
+    'uae': 'United Arab Emirates',
+    'united arab emirates': 'United Arab Emirates',
+    'israel': 'Israel',
+    'iran': 'Iran',
+    'pakistan': 'Pakistan',
+    'bangladesh': 'Bangladesh',
+    'vietnam': 'Vietnam',
+    'viet nam': 'Vietnam',
+    'thailand': 'Thailand',
+    'malaysia': 'Malaysia',
+    'philippines': 'Philippines',
+    'indonesia': 'Indonesia',
+    'turkey': 'Turkey',
+    'türkiye': 'Turkey'
+}
+
+# 常见的国家名称列表（简化版）
+COMMON_COUNTRIES = frozenset({
+    'United States', 'USA', 'US', 'America',
+    'China', 'PRC',
+    'India',
+    'Canada',
+    'Germany', 'Deutschland',
+    'United Kingdom', 'UK', 'Great Britain',
+    'France',
+    'Japan',
+    'Italy', 'Italia',
+    'Brazil', 'Brasil',
+    'Spain', 'España',
+    'Australia',
+    'Russia',
+    'Netherlands', 'Holland',
+    'Switzerland', 'Swiss',
+    'Belgium',
+    'Poland', 'Polska',
+    'Sweden', 'Sverige',
+    'Norway', 'Norge',
+    'Denmark', 'Danmark',
+    'Finland', 'Suomi',
+    'Singapore',
+    'South Korea', 'Korea',
+    'Mexico',
+    'Turkey', 'Türkiye'
+})
+
+# 小写国家名到标准写法的映射，用于不区分大小写的匹配
+COMMON_COUNTRIES_LOWER = {country.lower(): country for country in COMMON_COUNTRIES}
+
+# 常见公司名称映射
+COMPANY_MAPPING = {
+    'microsoft': 'Microsoft',
+    'google': 'Google',
+    'facebook': 'Facebook',
+    'meta': 'Meta',
+    'amazon': 'Amazon',
+    'apple': 'Apple',
+    'ibm': 'IBM',
+    'oracle': 'Oracle',
+    'microsoft corporation': 'Microsoft',
+    'google llc': 'Google',
+    'amazon.com': 'Amazon',
+    'apple inc': 'Apple',
+    'alibaba': 'Alibaba',
+    'tencent': 'Tencent',
+    'baidu': 'Baidu',
+    'bytedance': 'ByteDance',
+    'alibaba group': 'Alibaba',
+    'tencent holdings': 'Tencent',
+    'netflix': 'Netflix',
+    'spotify': 'Spotify',
+    'airbnb': 'Airbnb',
+    'uber': 'Uber',
+    'lyft': 'Lyft',
+    'salesforce': 'Salesforce',
+    'atlassian': 'Atlassian',
+    'docker': 'Docker',
+    'kubernetes': 'Kubernetes',
+    'apache software foundation': 'Apache',
+    'mozilla': 'Mozilla',
+    'linux foundation': 'Linux Foundation',
+    'red hat': 'Red Hat',
+    'vmware': 'VMware',
+    'nvidia': 'NVIDIA',
+    'intel': 'Intel',
+    'amd': 'AMD',
+    'qualcomm': 'Qualcomm',
+    'samsung': 'Samsung',
+    'sony': 'Sony',
+    'nintendo': 'Nintendo',
+    'tesla': 'Tesla',
+    'spacex': 'SpaceX',
+    'github': 'GitHub',
+    'gitlab': 'GitLab',
+    'bitbucket': 'Bitbucket',
+    'digitalocean': 'DigitalOcean',
+    'aws': 'AWS',
+    'azure': 'Microsoft Azure',
+    'gcp': 'Google Cloud',
+    'google cloud platform': 'Google Cloud',
+    'heroku': 'Heroku',
+    'slack': 'Slack',
+    'discord': 'Discord',
+    'twitter': 'Twitter',
+    'x corp': 'X (Twitter)',
+    'linkedin': 'LinkedIn',
+    'reddit': 'Reddit',
+    'pinterest': 'Pinterest',
+    'shopify': 'Shopify',
+    'stripe': 'Stripe',
+    'paypal': 'PayPal',
+    'square': 'Square',
+    'coinbase': 'Coinbase',
+    'binance': 'Binance',
+    'alphabet': 'Alphabet',
+    'alphabet inc': 'Alphabet',
+    'meta platform': 'Meta',
+    'meta platforms': 'Meta',
+    'meta platforms inc': 'Meta'
+}
+
 class DataProcessor:
-    """数据处理器，用于数据清洗和预处理"""
+    """数据处理器，用于数据清洗和预处理
+    
+    位置、国家和公司名称在GitHub数据中大量重复，对应的规范化方法使用LRU缓存，
+    相同输入只计算一次。
+    """
     
     @staticmethod
     def clean_text(text, max_length=1000):
@@ -28,10 +248,13 @@ class DataProcessor:
         text = str(text)
         
         # 移除多余的空白字符
-        text = re.sub(r'\s+', ' ', text)
+        text = WHITESPACE_RE.sub(' ', text)
         
-        # 移除特殊字符（保留基本的标点符号）
-        text = re.sub(r'[^\w\s.,!?-]', '', text)
+        # 移除特殊字符（保留基本的标点符号），纯ASCII文本用str.translate代替正则
+        if text.isascii():
+            text = text.translate(ASCII_SPECIAL_CHARS_TABLE)
+        else:
+            text = SPECIAL_CHARS_RE.sub('', text)
         
         # 截取最大长度
         if len(text) > max_length:
@@ -40,6 +263,33 @@ class DataProcessor:
         return text.strip()
     
     @staticmethod
+    def clean_text_series(series, max_length=1000):
+        """按列批量清洗文本数据，规则与clean_text相同
+        
+        使用pandas的向量化字符串方法处理整列，避免逐行调用clean_text。
+        
+        Args:
+            series: 待清洗的文本列（pandas Series），与clean_text一样，0、False等假值视为空文本；
+                    缺失值（None、NaN、NaT）也视为空文本
+            max_length: 最大长度
+            
+        Returns:
+            Series: 清洗后的文本列
+        """
+        text = series.where(series.astype(bool), '').fillna('').astype(str)
+        
+        # 移除多余的空白字符，再移除特殊字符（保留基本的标点符号）
+        text = text.str.replace(WHITESPACE_RE, ' ', regex=True)
+        text = text.str.replace(SPECIAL_CHARS_RE, '', regex=True)
+        
+        # 截取最大长度
+        too_long = text.str.len() > max_length
+        text = text.where(~too_long, text.str.slice(0, max_length) + '...')
+        
+        return text.str.strip()
+    
+    @staticmethod
+    @lru_cache(maxsize=8192)
     def normalize_location(location):
         """规范化地理位置信息
         
@@ -55,81 +305,14 @@ class DataProcessor:
         location = str(location).strip()
         
         # 移除多余的空白
-        location = re.sub(r'\s+', ' ', location)
+        location = WHITESPACE_RE.sub(' ', location)
         
         # 处理常见的格式问题
         location = location.replace(',,', ',').replace('  ', ' ')
         
-        # 常见的位置标准化映射
-        location_mapping = {
-            'usa': 'United States',
-            'us': 'United States',
-            'u.s.a.': 'United States',
-            'uk': 'United Kingdom',
-            'u.k.': 'United Kingdom',
-            'china': 'China',
-            'cina': 'China',
-            'india': 'India',
-            'canada': 'Canada',
-            'germany': 'Germany',
-            'deutschland': 'Germany',
-            'france': 'France',
-            'japan': 'Japan',
-            'italy': 'Italy',
-            'italia': 'Italy',
-            'brazil': 'Brazil',
-            'brasil': 'Brazil',
-            'spain': 'Spain',
-            'españa': 'Spain',
-            'russia': 'Russia',
-            'australia': 'Australia',
-            'switzerland': 'Switzerland',
-            'swiss': 'Switzerland',
-            'netherlands': 'Netherlands',
-            'nl': 'Netherlands',
-            'belgium': 'Belgium',
-            'poland': 'Poland',
-            'polska': 'Poland',
-            'ukraine': 'Ukraine',
-            'sweden': 'Sweden',
-            'sverige': 'Sweden',
-            'norway': 'Norway',
-            'norge': 'Norway',
-            'denmark': 'Denmark',
-            'danmark': 'Denmark',
-            'finland': 'Finland',
-            'suomi': 'Finland',
-            'singapore': 'Singapore',
-            'korea': 'South Korea',
-            'south korea': 'South Korea',
-            'republic of korea': 'South Korea',
-            'mexico': 'Mexico',
-            'argentina': 'Argentina',
-            'chile': 'Chile',
-            'colombia': 'Colombia',
-            'peru': 'Peru',
-            'south africa': 'South Africa',
-            'egypt': 'Egypt',
-            'saudi arabia': 'Saudi Arabia',
-            'uae': 'United Arab Emirates',
-            'united arab emirates': 'United Arab Emirates',
-            'israel': 'Israel',
-            'iran': 'Iran',
-            'pakistan': 'Pakistan',
-            'bangladesh': 'Bangladesh',
-            'vietnam': 'Vietnam',
-            'viet nam': 'Vietnam',
-            'thailand': 'Thailand',
-            'malaysia': 'Malaysia',
-            'philippines': 'Philippines',
-            'indonesia': 'Indonesia',
-            'turkey': 'Turkey',
-            'türkiye': 'Turkey'
-        }
-        
         # 转换为小写进行匹配
         location_lower = location.lower()
-        for key, value in location_mapping.items():
+        for key, value in LOCATION_MAPPING.items():
             if key in location_lower:
                 # 如果包含国家名，返回标准化的国家名
                 return value
@@ -138,6 +321,7 @@ class DataProcessor:
         return location if location else None
     
     @staticmethod
+    @lru_cache(maxsize=8192)
     def extract_country_from_location(location):
         """从位置信息中提取国家
         
@@ -156,49 +340,20 @@ class DataProcessor:
             # 取最后一部分作为国家
             country_candidate = parts[-1].strip()
             
-            # 常见的国家名称列表（简化版）
-            common_countries = {
-                'United States', 'USA', 'US', 'America',
-                'China', 'PRC',
-                'India',
-                'Canada',
-                'Germany', 'Deutschland',
-                'United Kingdom', 'UK', 'Great Britain',
-                'France',
-                'Japan',
-                'Italy', 'Italia',
-                'Brazil', 'Brasil',
-                'Spain', 'España',
-                'Australia',
-                'Russia',
-                'Netherlands', 'Holland',
-                'Switzerland', 'Swiss',
-                'Belgium',
-                'Poland', 'Polska',
-                'Sweden', 'Sverige',
-                'Norway', 'Norge',
-                'Denmark', 'Danmark',
-                'Finland', 'Suomi',
-                'Singapore',
-                'South Korea', 'Korea',
-                'Mexico',
-                'Turkey', 'Türkiye'
-            }
-            
             # 检查候选是否在常见国家列表中
-            if country_candidate in common_countries:
+            if country_candidate in COMMON_COUNTRIES:
                 return country_candidate
             
             # 检查候选的小写版本
-            country_lower = country_candidate.lower()
-            for country in common_countries:
-                if country_lower == country.lower():
-                    return country
+            country = COMMON_COUNTRIES_LOWER.get(country_candidate.lower())
+            if country:
+                return country
         
         # 如果无法识别，返回规范化后的位置
         return DataProcessor.normalize_location(location)
     
     @staticmethod
+    @lru_cache(maxsize=8192)
     def normalize_company(company):
         """规范化公司名称
         
@@ -214,101 +369,12 @@ class DataProcessor:
         company = str(company).strip()
         
         # 移除常见的前缀和后缀
-        patterns_to_remove = [
-            r'^@',  # 移除@符号
-            r'^the\s+',  # 移除开头的"The"
-            r',\s+inc\.?$',  # 移除结尾的", Inc."
-            r',\s+llc\.?$',  # 移除结尾的", LLC."
-            r',\s+corp\.?$',  # 移除结尾的", Corp."
-            r',\s+gmbh$',  # 移除结尾的", GmbH"
-            r',\s+ag$',  # 移除结尾的", AG"
-            r'\s+inc\.?$',  # 移除结尾的" Inc."
-            r'\s+llc\.?$',  # 移除结尾的" LLC."
-            r'\s+corp\.?$',  # 移除结尾的" Corp."
-            r'\s+gmbh$',  # 移除结尾的" GmbH"
-            r'\s+ag$',  # 移除结尾的" AG"
-        ]
-        
-        for pattern in patterns_to_remove:
-            company = re.sub(pattern, '', company, flags=re.IGNORECASE)
-        
-        # 常见公司名称映射
-        company_mapping = {
-            'microsoft': 'Microsoft',
-            'google': 'Google',
-            'facebook': 'Facebook',
-            'meta': 'Meta',
-            'amazon': 'Amazon',
-            'apple': 'Apple',
-            'ibm': 'IBM',
-            'oracle': 'Oracle',
-            'microsoft corporation': 'Microsoft',
-            'google llc': 'Google',
-            'amazon.com': 'Amazon',
-            'apple inc': 'Apple',
-            'alibaba': 'Alibaba',
-            'tencent': 'Tencent',
-            'baidu': 'Baidu',
-            'bytedance': 'ByteDance',
-            'alibaba group': 'Alibaba',
-            'tencent holdings': 'Tencent',
-            'netflix': 'Netflix',
-            'spotify': 'Spotify',
-            'airbnb': 'Airbnb',
-            'uber': 'Uber',
-            'lyft': 'Lyft',
-            'salesforce': 'Salesforce',
-            'atlassian': 'Atlassian',
-            'docker': 'Docker',
-            'kubernetes': 'Kubernetes',
-            'apache software foundation': 'Apache',
-            'mozilla': 'Mozilla',
-            'linux foundation': 'Linux Foundation',
-            'red hat': 'Red Hat',
-            'vmware': 'VMware',
-            'nvidia': 'NVIDIA',
-            'intel': 'Intel',
-            'amd': 'AMD',
-            'qualcomm': 'Qualcomm',
-            'samsung': 'Samsung',
-            'sony': 'Sony',
-            'nintendo': 'Nintendo',
-            'tesla': 'Tesla',
-            'spacex': 'SpaceX',
-            'github': 'GitHub',
-            'gitlab': 'GitLab',
-            'bitbucket': 'Bitbucket',
-            'digitalocean': 'DigitalOcean',
-            'aws': 'AWS',
-            'azure': 'Microsoft Azure',
-            'gcp': 'Google Cloud',
-            'google cloud platform': 'Google Cloud',
-            'heroku': 'Heroku',
-            'slack': 'Slack',
-            'discord': 'Discord',
-            'twitter': 'Twitter',
-            'x corp': 'X (Twitter)',
-            'linkedin': 'LinkedIn',
-            'reddit': 'Reddit',
-            'pinterest': 'Pinterest',
-            'shopify': 'Shopify',
-            'stripe': 'Stripe',
-            'paypal': 'PayPal',
-            'square': 'Square',
-            'coinbase': 'Coinbase',
-            'binance': 'Binance',
-            'alphabet': 'Alphabet',
-            'alphabet inc': 'Alphabet',
-            'meta platform': 'Meta',
-            'meta platforms': 'Meta',
-            'meta platforms inc': 'Meta'
-        }
+        company = COMPANY_SUFFIX_RE.sub(COMPANY_SUFFIX_REPL, COMPANY_PREFIX_RE.sub('', company, count=1), count=1)
         
         # 转换为小写进行匹配
-        company_lower = company.lower()
-        for key, value in company_mapping.items():
-            if key == company_lower:
-                return value
+        normalized = COMPANY_MAPPING.get(company.lower())
+        if normalized:
+            return normalized
         
         return company if company else None
     
@@ -325,16 +391,17 @@ class DataProcessor:
         if not date_string:
             return None
         
+        # GitHub API的标准格式（如2024-01-02T03:04:05Z）直接用C实现的fromisoformat解析
+        if (len(date_string) == 20 and date_string[19] == 'Z' and date_string[10] == 'T'
+                and date_string[4] == '-' and date_string[7] == '-'
+                and date_string[13] == ':' and date_string[16] == ':'):
+            try:
+                return datetime.fromisoformat(date_string[:-1])
+            except ValueError:
+                pass
+        
         # 尝试多种常见的日期时间格式
-        formats = [
-            '%Y-%m-%dT%H:%M:%SZ',
-            '%Y-%m-%d %H:%M:%S',
-            '%Y-%m-%d',
-            '%d/%m/%Y',
-            '%m/%d/%Y',
-        ]
-        
-        for fmt in formats:
+        for fmt in DATETIME_FORMATS:
             try:
                 return datetime.strptime(date_string, fmt)
             except ValueError:
@@ -343,6 +410,32 @@ class DataProcessor:
         logger.warning(f"无法解析日期时间: {date_string}")
         return None
     
+    @staticmethod
+    def parse_datetime_series(series):
+        """按列批量解析日期时间字符串，规则与parse_datetime相同
+        
+        每种格式对整列中尚未解析成功的值做一次向量化解析，避免逐行尝试格式和捕获异常。
+        
+        Args:
+            series: 日期时间字符串列（pandas Series）
+            
+        Returns:
+            Series: 解析后的日期时间列，无法解析的值为NaT
+        """
+        text = series.astype(str)
+        result = pd.Series(pd.NaT, index=series.index, dtype='datetime64[ns]')
+        remaining = series.notna() & (text != '')
+        
+        for fmt in DATETIME_FORMATS:
+            if not remaining.any():
+                break
+            result[remaining] = pd.to_datetime(text[remaining], format=fmt, errors='coerce')
+            remaining &= result.isna()
+        
+        if remaining.any():
+            logger.warning(f"无法解析 {int(remaining.sum())} 个日期时间值")
+        return result
+    
     @staticmethod
     def calculate_time_difference(start_date, end_date):
         """计算两个日期之间的时间差（天）
@@ -368,6 +461,26 @@ class DataProcessor:
         
         return (end_date - start_date).days
     
+    @staticmethod
+    def calculate_time_difference_series(start_series, end_series):
+        """按列批量计算两个日期列之间的时间差（天），规则与calculate_time_difference相同
+        
+        字符串列先经parse_datetime_series批量解析，再对两列整体相减。
+        
+        Args:
+            start_series: 开始日期列（pandas Series）
+            end_series: 结束日期列（pandas Series）
+            
+        Returns:
+            Series: 天数差，任一日期缺失或无法解析时为NaN
+        """
+        if not pd.api.types.is_datetime64_any_dtype(start_series):
+            start_series = DataProcessor.parse_datetime_series(start_series)
+        if not pd.api.types.is_datetime64_any_dtype(end_series):
+            end_series = DataProcessor.parse_datetime_series(end_series)
+        
+        return (end_series - start_series).dt.days
+    
     @staticmethod
     def remove_outliers(data, column, method='iqr', threshold=1.5):
         """移除数据中的异常值
@@ -381,39 +494,43 @@ class DataProcessor:
         Returns:
             DataFrame: 移除异常值后的数据集
         """
+        # 只读取数据，过滤结果本身就是新的DataFrame，无需复制输入；
+        # 出错时返回输入的副本，调用方修改返回值不会影响输入
         if isinstance(data, list):
             df = pd.DataFrame(data)
         else:
-            df = data.copy()
+            df = data
         
         if column not in df.columns:
             logger.error(f"列 {column} 不存在于数据中")
-            return df
+            return df.copy()
         
         # 移除缺失值
         df_clean = df.dropna(subset=[column])
+        # 取出列数据为numpy数组，后续统计和过滤都直接在数组上进行
+        values = df_clean[column].to_numpy(dtype=np.float64)
         
         if method == 'iqr':
-            # 使用IQR方法
-            Q1 = df_clean[column].quantile(0.25)
-            Q3 = df_clean[column].quantile(0.75)
+            # 使用IQR方法，一次调用同时计算两个分位数
+            Q1, Q3 = np.percentile(values, [25, 75]) if values.size else (np.nan, np.nan)
             IQR = Q3 - Q1
             lower_bound = Q1 - threshold * IQR
             upper_bound = Q3 + threshold * IQR
             
         elif method == 'zscore':
-            # 使用Z-score方法
-            mean = df_clean[column].mean()
-            std = df_clean[column].std()
+            # 使用Z-score方法（样本标准差，与pandas的std一致）
+            mean = values.mean() if values.size else np.nan
+            std = values.std(ddof=1) if values.size > 1 else np.nan
             lower_bound = mean - threshold * std
             upper_bound = mean + threshold * std
             
         else:
             logger.error(f"未知的异常值检测方法: {method}")
-            return df
+            return df.copy()
         
         # 过滤异常值
-        filtered_df = df_clean[(df_clean[column] >= lower_bound) & (df_clean[column] <= upper_bound)]
+        mask = (values >= lower_bound) & (values <= upper_bound)
+        filtered_df = df_clean.iloc[np.flatnonzero(mask)]
         
         logger.info(f"移除异常值: {len(df) - len(filtered_df)} 条记录被移除")
         return filtered_df
@@ -427,26 +544,30 @@ class DataProcessor:
             column: 列名
             
         Returns:
-            DataFrame: 归一化后的数据集
+            DataFrame: 归一化后的数据集（与输入共享原有列的数据）
         """
+        # 浅拷贝只复制列的引用，添加归一化列不会影响调用方的数据
         if isinstance(data, list):
             df = pd.DataFrame(data)
         else:
-            df = data.copy()
+            df = data.copy(deep=False)
         
         if column not in df.columns:
             logger.error(f"列 {column} 不存在于数据中")
             return df
         
-        # 移除缺失值
-        df_clean = df.dropna(subset=[column])
+        # 直接在整列数组上计算，缺失值忽略并在结果中保持为NaN，无需按索引对齐
+        values = df[column].to_numpy(dtype=np.float64)
         
         # 归一化（min-max scaling）
-        min_val = df_clean[column].min()
-        max_val = df_clean[column].max()
+        if np.isnan(values).all():
+            min_val = max_val = np.nan
+        else:
+            min_val = np.nanmin(values)
+            max_val = np.nanmax(values)
         
         if max_val > min_val:
-            df[f"{column}_normalized"] = (df_clean[column] - min_val) / (max_val - min_val)
+            df[f"{column}_normalized"] = (values - min_val) / (max_val - min_val)
         else:
             # 如果所有值都相同，设置为0
             df[f"{column}_normalized"] = 0
@@ -483,8 +604,35 @@ class DataProcessor:
                 logger.error(f"无法转换 {date_column} 为日期时间: {e}")
                 return df
         
-        # 按时间聚合
-        aggregated = df.resample(freq, on=date_column)[aggregation_column].count().reset_index()
+        # 按时间段分组计数，直接对转换后的Period分组，比resample的分箱开销小得多
+        try:
+            periods = df[date_column].dt.to_period(freq)
+            period_freq = periods.dt.freq
+        except ValueError:
+            # to_period不支持的别名（如'MS'、'ME'）
+            period_freq = None
+        
+        if (period_freq is None or period_freq.n != 1 or df[date_column].dt.tz is not None
+                or not isinstance(period_freq, PERIOD_START_LABEL_OFFSETS + PERIOD_END_LABEL_OFFSETS)):
+            # 分箱或标记方式与resample不同的频率（倍数、工作日、带时区等）仍使用resample
+            return df.resample(freq, on=date_column)[aggregation_column].count().reset_index()
+        
+        counts = df.groupby(periods)[aggregation_column].count()
+        if not counts.empty:
+            # 补齐没有数据的时间段，与resample的结果一致
+            counts = counts.reindex(
+                pd.period_range(counts.index.min(), counts.index.max(), freq=period_freq), fill_value=0
+            )
+        
+        # 与resample的默认标签一致：周、月、季、年以结束日期标记，天及更短的频率以开始时刻标记
+        if isinstance(period_freq, PERIOD_END_LABEL_OFFSETS):
+            labels = counts.index.to_timestamp(how='end').normalize()
+        else:
+            labels = counts.index.to_timestamp(how='start')
+        aggregated = pd.DataFrame({
+            date_column: labels,
+            aggregation_column: counts.to_numpy()
+        })
         return aggregated
 
 # 创建数据处理器实例
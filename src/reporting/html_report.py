@@ -1,26 +1,64 @@
 import os
+import gzip
 import logging
 import json
 from datetime import datetime
+from operator import itemgetter
 from src.utils.logger import reporting_logger
 
+# 优先使用orjson编码图表数据，未安装时回退到标准库json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = reporting_logger
 
-class HTMLReportGenerator:
-    """HTML报告生成器，负责创建带有动画效果的交互式HTML报告"""
+def _dumps_json(data):
+    """将图表数据编码为紧凑的JSON字符串
     
-    def __init__(self):
-        """初始化HTML报告生成器"""
-        self.template = self._load_template()
-    
-    def _load_template(self):
-        """加载HTML模板
-        
-        Returns:
-            str: HTML模板内容
-        """
-        # 简单的HTML模板，实际使用时可以替换为更复杂的模板
-        template = """
+    Args:
+        data: 可JSON序列化的数据
+        
+    Returns:
+        str: JSON字符串
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+# 名称-数值分布类图表的数据来源：(输出字段, 报告数据键, 分布子键)
+DISTRIBUTION_CHART_FIELDS = (
+    ('language_data', 'language_distribution', 'distribution'),
+    ('country_data', 'contributor_demographics', 'country_distribution'),
+    ('domain_data', 'project_domains', 'distribution'),
+)
+
+# 单条发现的HTML片段
+FINDING_CARD_TEMPLATE = """
+            <div class="finding-card">
+                <h4>{title}</h4>
+                <p>{description}</p>
+            </div>
+            """
+
+# 报告中固定的发现标题，顺序与generate中填入的描述一一对应
+FINDING_TITLES = (
+    'JavaScript仍然占主导地位',
+    '美国是主要贡献者来源',
+    'Web开发持续热门',
+    '项目活跃度增长',
+    '新项目数量可观',
+)
+
+# 发现部分的HTML骨架，在模块导入时按标题拼好，运行时只需按顺序填入描述
+FINDINGS_SKELETON = '\n'.join(
+    FINDING_CARD_TEMPLATE.format(title=title, description='{%d}' % index)
+    for index, title in enumerate(FINDING_TITLES)
+)
+
+# HTML报告模板，模块导入时创建一次、所有实例共享（简单模板，实际使用时可以替换为更复杂的模板）
+HTML_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="zh-CN">
 <head>
@@ -579,7 +617,33 @@ class HTMLReportGenerator:
 </body>
 </html>
         """
-        return template
+
+class HTMLReportGenerator:
+    """HTML报告生成器，负责创建带有动画效果的交互式HTML报告"""
+    
+    # 编译后的模板在所有实例间共享，只在首次生成报告时编译一次
+    _compiled_template = None
+    
+    # 已确认存在的输出目录，同一目录只需创建一次
+    _created_dirs = set()
+    
+    def __init__(self):
+        """初始化HTML报告生成器"""
+        self.template = HTML_TEMPLATE
+    
+    @classmethod
+    def _get_compiled_template(cls):
+        """获取编译后的模板
+        
+        首次调用时才导入Jinja2并编译模板，只导入本模块而不生成报告的进程无需承担这部分开销。
+        
+        Returns:
+            Template: 编译后的Jinja2模板
+        """
+        if cls._compiled_template is None:
+            from jinja2 import Environment
+            cls._compiled_template = Environment(autoescape=False).from_string(HTML_TEMPLATE)
+        return cls._compiled_template
     
     def _format_chart_data(self, chart_data):
         """格式化图表数据为JavaScript格式
@@ -590,169 +654,127 @@ class HTMLReportGenerator:
         Returns:
             dict: 格式化后的数据字典
         """
-        # 格式化语言数据 - 适配模拟数据格式
-        language_dist = chart_data.get('language_distribution', {})
-        language_items = language_dist.get('distribution', {})
-        language_data_list = [{'name': lang, 'value': value} for lang, value in language_items.items()]
-        language_data = json.dumps(language_data_list)
-        
-        # 格式化国家数据 - 适配模拟数据格式
-        country_dist = chart_data.get('contributor_demographics', {})
-        country_items = country_dist.get('country_distribution', {})
-        country_data_list = [{'name': country, 'value': value} for country, value in country_items.items()]
-        country_data = json.dumps(country_data_list)
-        
-        # 格式化领域数据 - 适配模拟数据格式
-        domain_dist = chart_data.get('project_domains', {})
-        domain_items = domain_dist.get('distribution', {})
-        domain_data_list = [{'name': domain, 'value': value} for domain, value in domain_items.items()]
-        domain_data = json.dumps(domain_data_list)
+        # 格式化名称-数值分布数据（语言、国家、领域） - 适配模拟数据格式
+        formatted = {
+            field: _dumps_json([
+                {'name': name, 'value': value}
+                for name, value in chart_data.get(key, {}).get(sub_key, {}).items()
+            ])
+            for field, key, sub_key in DISTRIBUTION_CHART_FIELDS
+        }
         
         # 格式化活跃度数据 - 适配模拟数据中的元组格式
         activity_data = chart_data.get('contributor_activity', {})
         activity_tuples = activity_data.get('commits_by_period', [])
-        activity_periods = [item[0] for item in activity_tuples]
-        activity_commits = [item[1] for item in activity_tuples]
+        activity_periods, activity_commits = map(list, zip(*activity_tuples)) if activity_tuples else ([], [])
         
         # 格式化生命周期数据 - 适配模拟数据中的元组格式
         lifecycle_data = chart_data.get('project_lifecycle', {})
         lifecycle_tuples = lifecycle_data.get('age_distribution', [])
-        lifecycle_groups = [item[0] for item in lifecycle_tuples]
-        lifecycle_counts = [item[1] for item in lifecycle_tuples]
-        
-        return {
-            'language_data': language_data,
-            'country_data': country_data,
-            'domain_data': domain_data,
-            'activity_periods': json.dumps(activity_periods),
-            'activity_commits': json.dumps(activity_commits),
-            'lifecycle_groups': json.dumps(lifecycle_groups),
-            'lifecycle_counts': json.dumps(lifecycle_counts)
-        }
-    
-    def _generate_findings_html(self, findings):
-        """生成发现部分的HTML
-        
-        Args:
-            findings: 发现列表
-            
-        Returns:
-            str: HTML字符串
-        """
-        findings_html = []
-        for finding in findings:
-            finding_html = f"""
-            <div class="finding-card">
-                <h4>{finding['title']}</h4>
-                <p>{finding['description']}</p>
-            </div>
-            """
-            findings_html.append(finding_html)
-        
-        return '\n'.join(findings_html)
+        lifecycle_groups, lifecycle_counts = map(list, zip(*lifecycle_tuples)) if lifecycle_tuples else ([], [])
+        
+        formatted.update({
+            'activity_periods': _dumps_json(activity_periods),
+            'activity_commits': _dumps_json(activity_commits),
+            'lifecycle_groups': _dumps_json(lifecycle_groups),
+            'lifecycle_counts': _dumps_json(lifecycle_counts)
+        })
+        return formatted
     
-    def generate(self, report_data, metadata, output_path):
+    def generate(self, report_data, metadata, output_path, compress=False):
         """生成HTML报告
         
         Args:
             report_data: 报告数据
             metadata: 元数据
             output_path: 输出路径
+            compress: 是否输出gzip压缩文件（文件名追加.gz后缀），便于通过Web服务器直接提供
             
         Returns:
             str: 生成的文件路径
         """
+        if compress:
+            output_path = f"{output_path}.gz"
         logger.info(f"生成HTML报告：{output_path}")
         
         # 确保输出目录存在
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        output_dir = os.path.dirname(output_path)
+        if output_dir not in self._created_dirs:
+            os.makedirs(output_dir, exist_ok=True)
+            self._created_dirs.add(output_dir)
         
         # 直接使用report_data作为chart_data，因为模拟数据的结构不同
         chart_data = report_data
         
-        # 提取摘要数据 - 从metadata和模拟数据中获取
-        total_projects = report_data.get('metadata', {}).get('total_projects', 0)
-        total_contributors = report_data.get('metadata', {}).get('total_contributors', 0)
-        total_commits = report_data.get('metadata', {}).get('total_commits', 0)
-        median_stars = report_data.get('project_metrics', {}).get('median_stars', 0)
+        # 各部分数据只从report_data中取一次，后续统一复用
+        report_meta = report_data.get('metadata', {})
+        language_dist = report_data.get('language_distribution', {}).get('distribution', {})
+        country_dist = report_data.get('contributor_demographics', {}).get('country_distribution', {})
+        domain_dist = report_data.get('project_domains', {}).get('distribution', {})
+        age_distribution = report_data.get('project_lifecycle', {}).get('age_distribution', [])
         
+        # 提取摘要数据 - 从metadata和模拟数据中获取
         summary = {
-            'total_projects': total_projects,
-            'total_contributors': total_contributors,
-            'total_commits': total_commits,
-            'median_stars': median_stars
+            'total_projects': report_meta.get('total_projects', 0),
+            'total_contributors': report_meta.get('total_contributors', 0),
+            'total_commits': report_meta.get('total_commits', 0),
+            'median_stars': report_data.get('project_metrics', {}).get('median_stars', 0)
         }
         
         # 格式化图表数据
         formatted_chart_data = self._format_chart_data(chart_data)
         
-        # 生成发现部分HTML - 基于模拟数据创建一些发现
-        findings = [
-            {
-                'title': 'JavaScript仍然占主导地位',
-                'description': f'JavaScript以{report_data.get("language_distribution", {}).get("distribution", {}).get("JavaScript", 0)}%的份额领先，显示前端开发仍然是活跃领域。'
-            },
-            {
-                'title': '美国是主要贡献者来源',
-                'description': f'美国贡献者占比{report_data.get("contributor_demographics", {}).get("country_distribution", {}).get("United States", 0)}%，反映了其在开源生态系统中的重要地位。'
-            },
-            {
-                'title': 'Web开发持续热门',
-                'description': f'Web开发项目占总数的{report_data.get("project_domains", {}).get("distribution", {}).get("Web Development", 0)}%，是最活跃的技术领域。'
-            },
-            {
-                'title': '项目活跃度增长',
-                'description': '最近几个月的提交活动呈上升趋势，显示开源社区参与度不断提高。'
-            },
-            {
-                'title': '新项目数量可观',
-                'description': f'约{report_data.get("project_lifecycle", {}).get("age_distribution", [])[0][1] if report_data.get("project_lifecycle", {}).get("age_distribution", []) else 0}个项目年龄不到1年，反映了持续的创新活力。'
-            }
-        ]
-        findings_html = self._generate_findings_html(findings)
+        # 生成发现部分HTML - 基于模拟数据填入各条发现的描述
+        findings_html = FINDINGS_SKELETON.format(
+            f'JavaScript以{language_dist.get("JavaScript", 0)}%的份额领先，显示前端开发仍然是活跃领域。',
+            f'美国贡献者占比{country_dist.get("United States", 0)}%，反映了其在开源生态系统中的重要地位。',
+            f'Web开发项目占总数的{domain_dist.get("Web Development", 0)}%，是最活跃的技术领域。',
+            '最近几个月的提交活动呈上升趋势，显示开源社区参与度不断提高。',
+            f'约{age_distribution[0][1] if age_distribution else 0}个项目年龄不到1年，反映了持续的创新活力。'
+        )
         
         # 获取其他需要的数据
-        language_dist = report_data.get('language_distribution', {}).get('distribution', {})
-        top_language = max(language_dist, key=language_dist.get) if language_dist else '未知'
-        top_language_percentage = str(language_dist.get(top_language, 0))
-        
-        country_dist = report_data.get('contributor_demographics', {}).get('country_distribution', {})
-        top_country = max(country_dist, key=country_dist.get) if country_dist else '未知'
-        
-        domain_dist = report_data.get('project_domains', {}).get('distribution', {})
-        top_domain = max(domain_dist, key=domain_dist.get) if domain_dist else '未知'
+        top_language, top_language_percentage = max(language_dist.items(), key=itemgetter(1)) if language_dist else ('未知', 0)
+        top_country = max(country_dist.items(), key=itemgetter(1))[0] if country_dist else '未知'
+        top_domain = max(domain_dist.items(), key=itemgetter(1))[0] if domain_dist else '未知'
         
         emerging_language = "Rust, Go, TypeScript"  # 默认值
         avg_response_time = report_data.get('community_health', {}).get('avg_response_time', '未知')
         
-        # 替换模板变量
-        html_content = self.template
-        html_content = html_content.replace('{{ analysis_period }}', metadata.get('analysis_period', '2025年以来'))
-        html_content = html_content.replace('{{ project_count }}', str(metadata.get('project_count', 0)))
-        html_content = html_content.replace('{{ generated_at }}', metadata.get('generated_at', datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
-        html_content = html_content.replace('{{ version }}', metadata.get('version', '1.0.0'))
-        html_content = html_content.replace('{{ total_projects }}', str(summary.get('total_projects', 0)))
-        html_content = html_content.replace('{{ total_contributors }}', str(summary.get('total_contributors', 0)))
-        html_content = html_content.replace('{{ total_commits }}', str(summary.get('total_commits', 0)))
-        html_content = html_content.replace('{{ median_stars }}', str(summary.get('median_stars', 0)))
-        html_content = html_content.replace('{{ top_language }}', top_language)
-        html_content = html_content.replace('{{ top_language_percentage }}', top_language_percentage)
-        html_content = html_content.replace('{{ top_country }}', top_country)
-        html_content = html_content.replace('{{ top_domain }}', top_domain)
-        html_content = html_content.replace('{{ emerging_language }}', emerging_language)
-        html_content = html_content.replace('{{ avg_response_time }}', str(avg_response_time))
-        html_content = html_content.replace('{{ language_data }}', formatted_chart_data['language_data'])
-        html_content = html_content.replace('{{ country_data }}', formatted_chart_data['country_data'])
-        html_content = html_content.replace('{{ domain_data }}', formatted_chart_data['domain_data'])
-        html_content = html_content.replace('{{ activity_periods }}', formatted_chart_data['activity_periods'])
-        html_content = html_content.replace('{{ activity_commits }}', formatted_chart_data['activity_commits'])
-        html_content = html_content.replace('{{ lifecycle_groups }}', formatted_chart_data['lifecycle_groups'])
-        html_content = html_content.replace('{{ lifecycle_counts }}', formatted_chart_data['lifecycle_counts'])
-        html_content = html_content.replace('{{ findings_html }}', findings_html)
-        
-        # 保存HTML文件
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # 模板变量
+        context = {
+            **summary,
+            'analysis_period': metadata.get('analysis_period', '2025年以来'),
+            'project_count': metadata.get('project_count', 0),
+            'generated_at': metadata['generated_at'] if 'generated_at' in metadata else datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'version': metadata.get('version', '1.0.0'),
+            'top_language': top_language,
+            'top_language_percentage': top_language_percentage,
+            'top_country': top_country,
+            'top_domain': top_domain,
+            'emerging_language': emerging_language,
+            'avg_response_time': avg_response_time,
+            'findings_html': findings_html,
+            **formatted_chart_data
+        }
+        # 渲染结果按块直接写入临时文件，不在内存中拼出完整字符串；
+        # 写完后再替换目标文件，避免留下或被读到写了一半的报告
+        temp_path = f"{output_path}.tmp"
+        try:
+            if compress:
+                output_file = gzip.open(temp_path, 'wt', encoding='utf-8', compresslevel=6)
+            else:
+                output_file = open(temp_path, 'w', encoding='utf-8')
+            with output_file as f:
+                self._get_compiled_template().stream(context).dump(f)
+            os.replace(temp_path, output_path)
+        except BaseException:
+            # 渲染或写入失败时删除临时文件，不在输出目录留下残缺文件
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
         
         logger.info(f"HTML报告已保存：{output_path}")
         return output_path
\ No newline at end of file
@@ -1,6 +1,8 @@
 import os
+import heapq
 import logging
 from datetime import datetime
+from operator import itemgetter
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, landscape
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -9,28 +11,118 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfbase.cidfonts import UnicodeCIDFont
 from src.utils.logger import reporting_logger
 
 logger = reporting_logger
 
+# 中文字体：reportlab内置的CID字体，无需额外的字体文件
+CJK_FONT_NAME = 'STSong-Light'
+
+def _build_table_style(header_color, align_commands):
+    """构建章节表格样式，各章节表格只有表头颜色和对齐方式不同
+    
+    Args:
+        header_color: 表头背景色（十六进制）
+        align_commands: 对齐方式命令
+        
+    Returns:
+        TableStyle: 表格样式对象
+    """
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(header_color)),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('FONTNAME', (0, 0), (-1, 0), CJK_FONT_NAME),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f0f0f0')),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('FONTNAME', (0, 1), (-1, -1), CJK_FONT_NAME),
+        ('FONTSIZE', (0, 1), (-1, -1), 11),
+        *align_commands,
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#d9d9d9'))
+    ])
+
+# 摘要统计表的行：(指标名称, 摘要数据键)
+SUMMARY_ROWS = (
+    ('分析项目总数', 'total_projects'),
+    ('贡献者总数', 'total_contributors'),
+    ('提交总数', 'total_commits'),
+    ('中位数星数', 'median_stars'),
+    ('中位数Forks', 'median_forks'),
+    ('中位数贡献者数', 'median_contributors'),
+)
+
+# 结论部分的主要发现，依次填入主导语言、主要贡献者来源、热门领域和平均响应时间
+CONCLUSION_FINDING_TEMPLATES = (
+    "编程语言分布显示 {} 占据主导地位，反映了当前技术栈趋势。",
+    "贡献者地域分布呈现全球化特征，{} 是最大的贡献者来源。",
+    "项目领域多样化，其中 {} 是最热门的技术领域。",
+    "社区活跃度维持在较高水平，平均响应时间为 {} 天。",
+)
+
+# 结论部分的未来展望
+OUTLOOKS = (
+    "跨领域技术融合将加速，特别是在人工智能、云计算和区块链等领域。",
+    "开源社区将更加全球化，来自新兴市场的贡献将显著增加。",
+    "项目维护和治理模式将进一步完善，提高开源项目的可持续性。",
+    "企业参与开源的深度和广度将继续扩大，形成更加繁荣的开源生态系统。",
+)
+
+# 表格对齐方式：整表居中，或首列左对齐、数值列居中
+CENTER_ALIGN = (('ALIGN', (0, 0), (-1, -1), 'CENTER'),)
+LABEL_VALUE_ALIGN = (('ALIGN', (0, 0), (0, -1), 'LEFT'), ('ALIGN', (1, 0), (1, -1), 'CENTER'))
+
+# 各章节表格样式，在模块导入时构建一次，所有报告共享
+SUMMARY_TABLE_STYLE = _build_table_style('#1890ff', CENTER_ALIGN)
+LANGUAGE_TABLE_STYLE = _build_table_style('#1890ff', LABEL_VALUE_ALIGN)
+CONTRIBUTOR_TABLE_STYLE = _build_table_style('#52c41a', LABEL_VALUE_ALIGN)
+DOMAIN_TABLE_STYLE = _build_table_style('#fa8c16', LABEL_VALUE_ALIGN)
+
 class PDFReportGenerator:
     """PDF报告生成器，负责创建格式化的PDF报告"""
     
+    # 样式表在所有实例间共享，只在首次创建实例时构建一次
+    _styles = None
+    
+    # 字体只需向reportlab注册一次，重复注册会拖慢每次报告生成
+    _fonts_registered = False
+    
+    # 已确认存在的输出目录，同一目录只需创建一次
+    _created_dirs = set()
+    
     def __init__(self):
         """初始化PDF报告生成器"""
+        self._register_fonts()
         self.styles = self._setup_styles()
     
-    def _setup_styles(self):
+    @classmethod
+    def _register_fonts(cls):
+        """注册报告中使用的中文字体，整个进程只注册一次"""
+        if cls._fonts_registered:
+            return
+        
+        pdfmetrics.registerFont(UnicodeCIDFont(CJK_FONT_NAME))
+        cls._fonts_registered = True
+    
+    @classmethod
+    def _setup_styles(cls):
         """设置PDF文档样式
         
         Returns:
             Stylesheet: 样式表对象
         """
+        if cls._styles is not None:
+            return cls._styles
+        
         styles = getSampleStyleSheet()
         
         # 自定义标题样式（添加Custom前缀避免冲突）
         styles.add(ParagraphStyle(
             name='CustomTitle',
+            fontName=CJK_FONT_NAME,
             fontSize=24,
             textColor=colors.HexColor('#1890ff'),
             alignment=TA_CENTER,
@@ -41,6 +133,7 @@ class PDFReportGenerator:
         # 自定义副标题样式
         styles.add(ParagraphStyle(
             name='CustomSubtitle',
+            fontName=CJK_FONT_NAME,
             fontSize=14,
             textColor=colors.grey,
             alignment=TA_CENTER,
@@ -51,6 +144,7 @@ class PDFReportGenerator:
         # 自定义章节标题样式
         styles.add(ParagraphStyle(
             name='CustomSectionTitle',
+            fontName=CJK_FONT_NAME,
             fontSize=18,
             textColor=colors.HexColor('#1890ff'),
             alignment=TA_LEFT,
@@ -65,6 +159,7 @@ class PDFReportGenerator:
         # 自定义子章节标题样式
         styles.add(ParagraphStyle(
             name='CustomSubsectionTitle',
+            fontName=CJK_FONT_NAME,
             fontSize=16,
             textColor=colors.HexColor('#52c41a'),
             alignment=TA_LEFT,
@@ -75,6 +170,7 @@ class PDFReportGenerator:
         # 自定义正文样式
         styles.add(ParagraphStyle(
             name='CustomBodyText',
+            fontName=CJK_FONT_NAME,
             fontSize=12,
             textColor=colors.black,
             alignment=TA_LEFT,
@@ -85,6 +181,7 @@ class PDFReportGenerator:
         # 自定义列表项样式
         styles.add(ParagraphStyle(
             name='CustomListItem',
+            fontName=CJK_FONT_NAME,
             fontSize=12,
             textColor=colors.black,
             alignment=TA_LEFT,
@@ -96,6 +193,7 @@ class PDFReportGenerator:
         # 自定义强调样式
         styles.add(ParagraphStyle(
             name='CustomEmphasis',
+            fontName=CJK_FONT_NAME,
             fontSize=12,
             textColor=colors.HexColor('#1890ff'),
             alignment=TA_LEFT,
@@ -106,12 +204,14 @@ class PDFReportGenerator:
         # 自定义页脚样式
         styles.add(ParagraphStyle(
             name='CustomFooter',
+            fontName=CJK_FONT_NAME,
             fontSize=10,
             textColor=colors.grey,
             alignment=TA_CENTER,
             leading=12
         ))
         
+        cls._styles = styles
         return styles
     
     def _add_cover_page(self, story, metadata):
@@ -139,6 +239,20 @@ class PDFReportGenerator:
         # 分页
         story.append(PageBreak())
     
+    def _add_table(self, story, header, rows, col_widths, table_style):
+        """添加数据表格，各章节表格只有表头、数据行、列宽和样式不同
+        
+        Args:
+            story: Platypus story对象
+            header: 表头行
+            rows: 数据行
+            col_widths: 各列宽度
+            table_style: 表格样式
+        """
+        table = Table([header, *rows], colWidths=col_widths)
+        table.setStyle(table_style)
+        story.append(table)
+    
     def _add_summary_section(self, story, summary):
         """添加摘要统计部分
         
@@ -148,38 +262,9 @@ class PDFReportGenerator:
         """
         story.append(Paragraph('<b>摘要统计</b>', self.styles['CustomSectionTitle']))
         
-        # 创建统计数据表格
-        data = [
-            ['指标', '数值'],
-            ['分析项目总数', str(summary.get('total_projects', 0))],
-            ['贡献者总数', str(summary.get('total_contributors', 0))],
-            ['提交总数', str(summary.get('total_commits', 0))],
-            ['中位数星数', str(summary.get('median_stars', 0))],
-            ['中位数Forks', str(summary.get('median_forks', 0))],
-            ['中位数贡献者数', str(summary.get('median_contributors', 0))]
-        ]
-        
-        table = Table(data, colWidths=[8*cm, 6*cm])
-        
-        # 设置表格样式
-        table_style = TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1890ff')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f0f0f0')),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 11),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#d9d9d9'))
-        ])
-        
-        table.setStyle(table_style)
-        story.append(table)
+        # 统计数据表格
+        rows = ([label, str(summary.get(key, 0))] for label, key in SUMMARY_ROWS)
+        self._add_table(story, ['指标', '数值'], rows, [8*cm, 6*cm], SUMMARY_TABLE_STYLE)
         story.append(Spacer(1, 2*cm))
     
     def _add_language_section(self, story, language_data):
@@ -191,36 +276,12 @@ class PDFReportGenerator:
         """
         story.append(Paragraph('<b>编程语言分布</b>', self.styles['CustomSectionTitle']))
         
-        # 创建语言分布表格
+        # 语言分布表格
         languages = language_data.get('distribution', {})
-        top_languages = sorted(languages.items(), key=lambda x: x[1], reverse=True)[:10]
-        
-        data = [['编程语言', '占比 (%)']]
-        for lang, percentage in top_languages:
-            data.append([lang, f"{percentage:.1f}"])
-        
-        table = Table(data, colWidths=[10*cm, 4*cm])
-        
-        # 设置表格样式
-        table_style = TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1890ff')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f0f0f0')),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 11),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#d9d9d9'))
-        ])
+        top_languages = heapq.nlargest(10, languages.items(), key=itemgetter(1))
         
-        table.setStyle(table_style)
-        story.append(table)
+        rows = ([lang, f"{percentage:.1f}"] for lang, percentage in top_languages)
+        self._add_table(story, ['编程语言', '占比 (%)'], rows, [10*cm, 4*cm], LANGUAGE_TABLE_STYLE)
         
         # 添加洞察
         if top_languages:
@@ -243,34 +304,10 @@ class PDFReportGenerator:
         # 贡献者地域分布
         story.append(Paragraph('<b>贡献者地域分布（前10名）</b>', self.styles['CustomSubsectionTitle']))
         country_data = contributor_data.get('country_distribution', {})
-        top_countries = sorted(country_data.items(), key=lambda x: x[1], reverse=True)[:10]
-        
-        data = [['国家/地区', '贡献者数量']]
-        for country, count in top_countries:
-            data.append([country, str(count)])
-        
-        table = Table(data, colWidths=[10*cm, 4*cm])
-        
-        # 设置表格样式
-        table_style = TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#52c41a')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f0f0f0')),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 11),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#d9d9d9'))
-        ])
+        top_countries = heapq.nlargest(10, country_data.items(), key=itemgetter(1))
         
-        table.setStyle(table_style)
-        story.append(table)
+        rows = ([country, str(count)] for country, count in top_countries)
+        self._add_table(story, ['国家/地区', '贡献者数量'], rows, [10*cm, 4*cm], CONTRIBUTOR_TABLE_STYLE)
         story.append(Spacer(1, 2*cm))
     
     def _add_project_domains_section(self, story, domain_data):
@@ -284,34 +321,10 @@ class PDFReportGenerator:
         
         # 项目领域分布
         domains = domain_data.get('distribution', {})
-        top_domains = sorted(domains.items(), key=lambda x: x[1], reverse=True)[:10]
-        
-        data = [['项目领域', '项目数量']]
-        for domain, count in top_domains:
-            data.append([domain, str(count)])
-        
-        table = Table(data, colWidths=[10*cm, 4*cm])
-        
-        # 设置表格样式
-        table_style = TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#fa8c16')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f0f0f0')),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 11),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#d9d9d9'))
-        ])
+        top_domains = heapq.nlargest(10, domains.items(), key=itemgetter(1))
         
-        table.setStyle(table_style)
-        story.append(table)
+        rows = ([domain, str(count)] for domain, count in top_domains)
+        self._add_table(story, ['项目领域', '项目数量'], rows, [10*cm, 4*cm], DOMAIN_TABLE_STYLE)
         
         # 新兴领域
         emerging_domains = domain_data.get('emerging_domains', [])
@@ -360,27 +373,21 @@ class PDFReportGenerator:
         # 获取主要发现数据
         language_data = report_data.get('language_distribution', {})
         languages = language_data.get('distribution', {})
-        top_language = list(languages.keys())[0] if languages else '未知'
+        top_language = max(languages.items(), key=itemgetter(1))[0] if languages else '未知'
         
         contributor_data = report_data.get('contributor_demographics', {})
         country_data = contributor_data.get('country_distribution', {})
-        top_country = list(country_data.keys())[0] if country_data else '未知'
+        top_country = max(country_data.items(), key=itemgetter(1))[0] if country_data else '未知'
         
         domain_data = report_data.get('project_domains', {})
         domains = domain_data.get('distribution', {})
-        top_domain = list(domains.keys())[0] if domains else '未知'
+        top_domain = max(domains.items(), key=itemgetter(1))[0] if domains else '未知'
         
         avg_response_time = report_data.get('community_health', {}).get('avg_response_time', '未知')
         
-        findings = [
-            f"编程语言分布显示 {top_language} 占据主导地位，反映了当前技术栈趋势。",
-            f"贡献者地域分布呈现全球化特征，{top_country} 是最大的贡献者来源。",
-            f"项目领域多样化，其中 {top_domain} 是最热门的技术领域。",
-            f"社区活跃度维持在较高水平，平均响应时间为 {avg_response_time} 天。"
-        ]
-        
-        for finding in findings:
-            story.append(Paragraph(f"• {finding}", self.styles['CustomListItem']))
+        finding_values = (top_language, top_country, top_domain, avg_response_time)
+        for template, value in zip(CONCLUSION_FINDING_TEMPLATES, finding_values):
+            story.append(Paragraph(f"• {template.format(value)}", self.styles['CustomListItem']))
         
         # 未来展望
         story.append(Spacer(1, 1*cm))
@@ -389,14 +396,7 @@ class PDFReportGenerator:
         outlook_text = "随着开源运动的持续发展，我们预计以下趋势将在未来进一步强化："
         story.append(Paragraph(outlook_text, self.styles['CustomBodyText']))
         
-        outlooks = [
-            "跨领域技术融合将加速，特别是在人工智能、云计算和区块链等领域。",
-            "开源社区将更加全球化，来自新兴市场的贡献将显著增加。",
-            "项目维护和治理模式将进一步完善，提高开源项目的可持续性。",
-            "企业参与开源的深度和广度将继续扩大，形成更加繁荣的开源生态系统。"
-        ]
-        
-        for i, outlook in enumerate(outlooks, 1):
+        for i, outlook in enumerate(OUTLOOKS, 1):
             story.append(Paragraph(f"{i}. {outlook}", self.styles['CustomListItem']))
     
     def _add_page_footer(self, canvas, doc):
@@ -408,7 +408,7 @@ class PDFReportGenerator:
         """
         canvas.saveState()
         footer_text = f"Page {doc.page} | GitHub开源项目分析报告"
-        canvas.setFont('Helvetica', 9)
+        canvas.setFont(CJK_FONT_NAME, 9)
         canvas.setFillColor(colors.grey)
         canvas.drawCentredString(doc.width/2 + doc.leftMargin, 1.5*cm, footer_text)
         canvas.restoreState()
@@ -427,11 +427,16 @@ class PDFReportGenerator:
         logger.info(f"生成PDF报告：{output_path}")
         
         # 确保输出目录存在
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        # 创建PDF文档
+        output_dir = os.path.dirname(output_path)
+        if output_dir not in self._created_dirs:
+            os.makedirs(output_dir, exist_ok=True)
+            self._created_dirs.add(output_dir)
+        
+        # 创建PDF文档：reportlab在构建完成后一次性写出整个文件，
+        # 先写到临时文件再替换目标文件，避免被读到写了一半的报告
+        temp_path = f"{output_path}.tmp"
         doc = SimpleDocTemplate(
-            output_path,
+            temp_path,
             pagesize=A4,
             rightMargin=2*cm,
             leftMargin=2*cm,
@@ -469,7 +474,16 @@ class PDFReportGenerator:
         self._add_conclusion_section(story, report_data, metadata)
         
         # 构建PDF
-        doc.build(story, onFirstPage=self._add_page_footer, onLaterPages=self._add_page_footer)
+        try:
+            doc.build(story, onFirstPage=self._add_page_footer, onLaterPages=self._add_page_footer)
+            os.replace(temp_path, output_path)
+        except BaseException:
+            # 构建或写入失败时删除临时文件，不在输出目录留下残缺文件
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
         
         logger.info(f"PDF报告已保存：{output_path}")
         return output_path
\ No newline at end of file
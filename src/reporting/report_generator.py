@@ -1,20 +1,48 @@
 import os
 import json
+import heapq
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from operator import itemgetter
 from src.utils.config import config
 from src.utils.logger import reporting_logger
 from src.reporting.html_report import HTMLReportGenerator
 
-# 尝试导入PDF报告生成器，如果失败则记录但不终止
-PDFReportGenerator = None
+# 优先使用orjson写出报告数据，未安装时回退到标准库json
 try:
-    from src.reporting.pdf_report import PDFReportGenerator
+    import orjson
 except ImportError:
-    reporting_logger.warning("PDF报告生成功能需要安装reportlab库")
+    orjson = None
 
 logger = reporting_logger
 
+# 图表中每个分布展示的条目数
+CHART_TOP_N = 15
+
+# 分布字典的来源：(图表数据键, 报告数据中的章节, 章节中的分布字段)
+DISTRIBUTION_SOURCES = (
+    ('language_distribution', 'language_distribution', 'distribution'),
+    ('contributor_countries', 'contributor_demographics', 'country_distribution'),
+    ('project_domains', 'project_domains', 'distribution'),
+)
+
+def _json_default(obj):
+    """JSON编码回调：把报告数据中的生成器等迭代器转换为列表
+    
+    Args:
+        obj: 编码器无法直接序列化的对象
+        
+    Returns:
+        list: 迭代器展开后的列表
+    
+    Raises:
+        TypeError: 对象不是可展开的迭代器时
+    """
+    if hasattr(obj, '__iter__') and not isinstance(obj, (str, bytes, dict, list, tuple, set)):
+        return list(obj)
+    raise TypeError(f"无法序列化的类型: {type(obj).__name__}")
+
 class ReportGenerator:
     """报告生成器核心类，负责协调整个报告生成流程"""
     
@@ -22,10 +50,15 @@ class ReportGenerator:
         """初始化报告生成器"""
         self.output_dir = config.OUTPUT_DIR
         self.html_report = HTMLReportGenerator()
-        self.pdf_report = PDFReportGenerator() if PDFReportGenerator is not None else None
+        # PDF报告生成器在首次生成PDF时才创建，未生成PDF的进程无需导入reportlab
+        self.pdf_report = None
         self.report_data = {}
+        # 摘要、图表数据和发现是否已为当前加载的数据准备好
+        self._prepared = False
+        # 各分布字典的前N项，图表数据和发现共用
+        self._top_items = None
+        # 生成时间在首次输出报告时才记录，见_stamp_generated_at
         self.report_metadata = {
-            'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'version': '1.0.0',
             'analysis_period': '2025年以来',
             'project_count': config.MAX_PROJECTS
@@ -39,8 +72,48 @@ class ReportGenerator:
         """
         logger.info("加载分析结果数据")
         self.report_data = analysis_results
+        self._prepared = False
+        self._top_items = None
+        # 新数据的报告重新记录生成时间
+        self.report_metadata.pop('generated_at', None)
         self.report_metadata['actual_projects_analyzed'] = analysis_results.get('metadata', {}).get('total_projects', 0)
     
+    def _stamp_generated_at(self):
+        """记录当前数据的报告生成时间，同一份数据只记录一次，保证各类报告的时间一致"""
+        if 'generated_at' not in self.report_metadata:
+            self.report_metadata['generated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    def _ensure_prepared(self):
+        """确保摘要、图表数据和发现已准备好，同一份数据只准备一次"""
+        if self._prepared:
+            return
+        
+        self.generate_summary_statistics()
+        self.prepare_chart_data()
+        self.prepare_interesting_findings()
+        self._prepared = True
+    
+    def _get_top_items(self):
+        """获取各分布字典中数值最大的前N个(键, 值)，按数值降序排列
+        
+        每个分布字典只遍历一次，图表数据取前N项，发现直接取第一项。
+        heapq.nlargest是稳定的，数值相同时保留先出现的项，与max的结果一致。
+        
+        Returns:
+            dict: 图表数据键到(键, 值)列表的映射
+        """
+        if self._top_items is None:
+            report_data = self.report_data
+            self._top_items = {
+                name: heapq.nlargest(
+                    CHART_TOP_N,
+                    report_data.get(section, {}).get(field, {}).items(),
+                    key=itemgetter(1)
+                )
+                for name, section, field in DISTRIBUTION_SOURCES
+            }
+        return self._top_items
+    
     def generate_summary_statistics(self):
         """生成摘要统计信息
         
@@ -49,17 +122,20 @@ class ReportGenerator:
         """
         logger.info("生成摘要统计信息")
         
-        # 提取关键统计数据
+        # 提取关键统计数据，同一子树只取一次
+        report_data = self.report_data
+        metadata = report_data.get('metadata', {})
+        project_metrics = report_data.get('project_metrics', {})
         summary = {
-            'total_projects': self.report_data.get('metadata', {}).get('total_projects', 0),
-            'total_contributors': self.report_data.get('metadata', {}).get('total_contributors', 0),
-            'total_commits': self.report_data.get('metadata', {}).get('total_commits', 0),
-            'top_languages': self.report_data.get('language_distribution', {}).get('top_languages', []),
-            'top_countries': self.report_data.get('contributor_demographics', {}).get('top_countries', []),
-            'top_domains': self.report_data.get('project_domains', {}).get('top_domains', []),
-            'median_stars': self.report_data.get('project_metrics', {}).get('median_stars', 0),
-            'median_forks': self.report_data.get('project_metrics', {}).get('median_forks', 0),
-            'median_contributors': self.report_data.get('project_metrics', {}).get('median_contributors', 0)
+            'total_projects': metadata.get('total_projects', 0),
+            'total_contributors': metadata.get('total_contributors', 0),
+            'total_commits': metadata.get('total_commits', 0),
+            'top_languages': report_data.get('language_distribution', {}).get('top_languages', []),
+            'top_countries': report_data.get('contributor_demographics', {}).get('top_countries', []),
+            'top_domains': report_data.get('project_domains', {}).get('top_domains', []),
+            'median_stars': project_metrics.get('median_stars', 0),
+            'median_forks': project_metrics.get('median_forks', 0),
+            'median_contributors': project_metrics.get('median_contributors', 0)
         }
         
         # 保存摘要到报告数据中
@@ -74,6 +150,8 @@ class ReportGenerator:
         """
         logger.info("准备图表数据")
         
+        # 同一方法内多次访问，绑定为局部变量
+        report_data = self.report_data
         chart_data = {
             'language_distribution': [],
             'contributor_countries': [],
@@ -82,50 +160,28 @@ class ReportGenerator:
             'project_age_distribution': []
         }
         
-        # 辅助函数：高效获取排序后的前N个元素
-        def get_top_n_items(data_dict, n=15):
-            # 使用生成器表达式而不是列表推导式，避免创建大列表
-            return list([
-                {'name': key, 'value': value}
-                for _, key, value in sorted(
-                    ((-value, key, value) for key, value in data_dict.items()),
-                    key=lambda x: x[0]
-                )[:n]
-            ])
-        
-        # 准备编程语言分布图数据
-        if 'language_distribution' in self.report_data:
-            languages = self.report_data['language_distribution'].get('distribution', {})
-            chart_data['language_distribution'] = get_top_n_items(languages)
-        
-        # 准备贡献者国家分布数据
-        if 'contributor_demographics' in self.report_data:
-            countries = self.report_data['contributor_demographics'].get('country_distribution', {})
-            chart_data['contributor_countries'] = get_top_n_items(countries)
-        
-        # 准备项目领域分布数据
-        if 'project_domains' in self.report_data:
-            domains = self.report_data['project_domains'].get('distribution', {})
-            chart_data['project_domains'] = get_top_n_items(domains)
-        
-        # 准备贡献者活跃度数据 - 直接使用生成器表达式
-        if 'contributor_activity' in self.report_data:
-            activity = self.report_data['contributor_activity'].get('commits_by_period', [])
-            chart_data['contributor_activity'] = (
+        # 准备编程语言、贡献者国家和项目领域的分布图数据
+        for name, top_items in self._get_top_items().items():
+            chart_data[name] = [{'name': key, 'value': value} for key, value in top_items]
+        
+        # 准备贡献者活跃度数据
+        if 'contributor_activity' in report_data:
+            activity = report_data['contributor_activity'].get('commits_by_period', [])
+            chart_data['contributor_activity'] = [
                 {'period': period, 'commits': count}
                 for period, count in activity
-            )
+            ]
         
-        # 准备项目年龄分布数据 - 直接使用生成器表达式
-        if 'project_lifecycle' in self.report_data:
-            age_dist = self.report_data['project_lifecycle'].get('age_distribution', [])
-            chart_data['project_age_distribution'] = (
+        # 准备项目年龄分布数据
+        if 'project_lifecycle' in report_data:
+            age_dist = report_data['project_lifecycle'].get('age_distribution', [])
+            chart_data['project_age_distribution'] = [
                 {'age_group': group, 'count': count}
                 for group, count in age_dist
-            )
+            ]
         
         # 保存图表数据到报告数据中
-        self.report_data['chart_data'] = chart_data
+        report_data['chart_data'] = chart_data
         return chart_data
     
     def prepare_interesting_findings(self):
@@ -138,45 +194,32 @@ class ReportGenerator:
         
         findings = []
         
-        # 辅助函数：高效获取字典中的最大值项
-        def get_max_item(data_dict):
-            if not data_dict:
-                return None
-            # 使用迭代器逐个比较，避免创建整个列表
-            max_key = None
-            max_value = -float('inf')
-            for key, value in data_dict.items():
-                if value > max_value:
-                    max_value = value
-                    max_key = key
-            return max_key, max_value
+        report_data = self.report_data
+        # 各分布中数值最大的(键, 值)即前N项中的第一项
+        top_items = self._get_top_items()
         
         # 基于数据生成洞察
         # 1. 最流行的编程语言
-        if 'language_distribution' in self.report_data:
-            languages = self.report_data['language_distribution'].get('distribution', {})
-            top_lang = get_max_item(languages)
-            if top_lang:
-                findings.append({
-                    'title': '最受欢迎的编程语言',
-                    'description': f"{top_lang[0]} 是分析期间最受欢迎的编程语言，占比 {top_lang[1]}%。",
-                    'type': 'language'
-                })
+        top_lang = top_items['language_distribution'][0] if top_items['language_distribution'] else None
+        if top_lang:
+            findings.append({
+                'title': '最受欢迎的编程语言',
+                'description': f"{top_lang[0]} 是分析期间最受欢迎的编程语言，占比 {top_lang[1]}%。",
+                'type': 'language'
+            })
         
         # 2. 贡献者地域分布
-        if 'contributor_demographics' in self.report_data:
-            countries = self.report_data['contributor_demographics'].get('country_distribution', {})
-            top_country = get_max_item(countries)
-            if top_country:
-                findings.append({
-                    'title': '主要贡献者来源国',
-                    'description': f"{top_country[0]} 是最大的贡献者来源国，贡献了约 {top_country[1]}% 的贡献者。",
-                    'type': 'geography'
-                })
+        top_country = top_items['contributor_countries'][0] if top_items['contributor_countries'] else None
+        if top_country:
+            findings.append({
+                'title': '主要贡献者来源国',
+                'description': f"{top_country[0]} 是最大的贡献者来源国，贡献了约 {top_country[1]}% 的贡献者。",
+                'type': 'geography'
+            })
         
         # 3. 项目活跃度指标
-        if 'community_health' in self.report_data:
-            avg_response_time = self.report_data['community_health'].get('avg_response_time', 0)
+        if 'community_health' in report_data:
+            avg_response_time = report_data['community_health'].get('avg_response_time', 0)
             findings.append({
                 'title': '社区响应速度',
                 'description': f"项目的平均问题响应时间为 {avg_response_time} 天，反映了社区的活跃度和维护质量。",
@@ -184,8 +227,8 @@ class ReportGenerator:
             })
         
         # 4. 新兴技术领域 - 使用迭代器获取前3个元素
-        if 'project_domains' in self.report_data:
-            emerging_domains = self.report_data['project_domains'].get('emerging_domains', [])
+        if 'project_domains' in report_data:
+            emerging_domains = report_data['project_domains'].get('emerging_domains', [])
             if emerging_domains:
                 # 生成器表达式获取前3个元素
                 top_emerging_domains = (domain for i, domain in enumerate(emerging_domains) if i < 3)
@@ -197,8 +240,8 @@ class ReportGenerator:
                 })
         
         # 5. 项目规模洞察
-        if 'project_metrics' in self.report_data:
-            median_size = self.report_data['project_metrics'].get('median_size', 0)
+        if 'project_metrics' in report_data:
+            median_size = report_data['project_metrics'].get('median_size', 0)
             findings.append({
                 'title': '项目规模特征',
                 'description': f"分析的项目中位数大小为 {median_size} KB，显示了当前开源项目的典型规模。",
@@ -206,7 +249,7 @@ class ReportGenerator:
             })
         
         # 保存洞察到报告数据中
-        self.report_data['interesting_findings'] = findings
+        report_data['interesting_findings'] = findings
         return findings
     
     def save_report_data(self, filename='report_data.json'):
@@ -219,33 +262,31 @@ class ReportGenerator:
             str: 保存的文件路径
         """
         logger.info(f"保存报告数据到 {filename}")
+        self._stamp_generated_at()
         
         # 确保输出目录存在
         os.makedirs(self.output_dir, exist_ok=True)
         
-        # 处理报告数据中的生成器，转换为列表以便JSON序列化
-        def process_generator_data(data):
-            """递归处理数据中的生成器，转换为列表"""
-            if isinstance(data, dict):
-                return {key: process_generator_data(value) for key, value in data.items()}
-            elif isinstance(data, (list, tuple)):
-                return [process_generator_data(item) for item in data]
-            elif hasattr(data, '__iter__') and not isinstance(data, (str, bytes, dict, list, tuple, set)):
-                # 如果是生成器或其他迭代器，转换为列表
-                return list(data)
-            return data
-        
-        # 合并并处理所有数据
-        report_data_processed = process_generator_data(self.report_data)
+        # 合并所有数据直接序列化；调用方传入的数据中若有生成器，由编码回调转换为列表
         full_report_data = {
             'metadata': self.report_metadata,
-            'data': report_data_processed
+            'data': self.report_data
         }
         
         # 保存到文件
         file_path = os.path.join(self.output_dir, filename)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(full_report_data, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            with open(file_path, 'wb') as f:
+                f.write(orjson.dumps(
+                    full_report_data,
+                    default=_json_default,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                ))
+        else:
+            # 先编码为完整字符串再一次写入，避免json.dump逐块调用write
+            content = json.dumps(full_report_data, ensure_ascii=False, indent=2, default=_json_default)
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(content)
         
         logger.info(f"报告数据已保存到 {file_path}")
         return file_path
@@ -262,9 +303,8 @@ class ReportGenerator:
         logger.info("开始生成HTML报告")
         
         # 准备报告数据
-        self.generate_summary_statistics()
-        self.prepare_chart_data()
-        self.prepare_interesting_findings()
+        self._ensure_prepared()
+        self._stamp_generated_at()
         
         # 生成HTML报告
         file_path = self.html_report.generate(
@@ -276,6 +316,25 @@ class ReportGenerator:
         logger.info(f"HTML报告已生成：{file_path}")
         return file_path
     
+    def _get_pdf_report(self):
+        """获取PDF报告生成器，首次调用时才导入reportlab并创建
+        
+        Returns:
+            PDFReportGenerator: PDF报告生成器
+        
+        Raises:
+            ImportError: 当缺少reportlab库时
+        """
+        if self.pdf_report is None:
+            try:
+                from src.reporting.pdf_report import PDFReportGenerator
+            except ImportError:
+                error_msg = "PDF报告生成功能未可用，请安装reportlab库：pip install reportlab Pillow"
+                reporting_logger.error(error_msg)
+                raise ImportError(error_msg)
+            self.pdf_report = PDFReportGenerator()
+        return self.pdf_report
+    
     def generate_pdf_report(self, filename='github_analysis_report.pdf'):
         """生成PDF报告
         
@@ -290,18 +349,15 @@ class ReportGenerator:
         """
         logger.info("开始生成PDF报告")
         
-        # 检查PDF生成器是否可用
-        if PDFReportGenerator is None:
-            error_msg = "PDF报告生成功能未可用，请安装reportlab库：pip install reportlab Pillow"
-            reporting_logger.error(error_msg)
-            raise ImportError(error_msg)
+        # 获取PDF生成器，缺少reportlab时抛出ImportError
+        pdf_report = self._get_pdf_report()
         
         # 确保数据已准备好
-        if not self.report_data.get('summary'):
-            self.generate_summary_statistics()
+        self._ensure_prepared()
+        self._stamp_generated_at()
         
         # 生成PDF报告
-        file_path = self.pdf_report.generate(
+        file_path = pdf_report.generate(
             report_data=self.report_data,
             metadata=self.report_metadata,
             output_path=os.path.join(self.output_dir, filename)
@@ -318,27 +374,23 @@ class ReportGenerator:
         """
         logger.info("开始生成所有报告")
         
-        # 准备所有报告数据
-        self.generate_summary_statistics()
-        self.prepare_chart_data()
-        self.prepare_interesting_findings()
+        # 准备所有报告数据并记录生成时间，之后生成各类报告时直接复用
+        self._ensure_prepared()
+        self._stamp_generated_at()
         
-        # 保存报告数据
-        data_file = self.save_report_data()
-        
-        # 生成HTML报告
-        html_file = self.generate_html_report()
-        
-        # 生成PDF报告
-        pdf_file = self.generate_pdf_report()
+        # 数据准备好后三类输出互不依赖，并行保存数据、生成HTML和PDF报告
+        report_tasks = [
+            ('data_file', self.save_report_data),
+            ('html_report', self.generate_html_report),
+            ('pdf_report', self.generate_pdf_report)
+        ]
+        with ThreadPoolExecutor(max_workers=len(report_tasks)) as executor:
+            futures = {key: executor.submit(task) for key, task in report_tasks}
+            results = {key: future.result() for key, future in futures.items()}
         
         logger.info("所有报告生成完成")
         
-        return {
-            'data_file': data_file,
-            'html_report': html_file,
-            'pdf_report': pdf_file
-        }
+        return results
 
 # 创建报告生成器实例
-report_generator = ReportGenerator()
\ No newline at end of file
+report_generator = ReportGenerator()
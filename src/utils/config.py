@@ -1,4 +1,5 @@
 import os
+import functools
 from dotenv import load_dotenv
 import logging
 
@@ -22,9 +23,12 @@ class Config:
     DB_USER = os.getenv('DB_USER', 'admin')
     DB_PASSWORD = os.getenv('DB_PASSWORD', 'password')
     DB_NAME = os.getenv('DB_NAME', 'example_db')
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '8'))
     
     # 项目配置
     OUTPUT_DIR = os.getenv('OUTPUT_DIR', 'output')
+    # 综合分析结果等磁盘缓存的目录
+    CACHE_DIR = os.getenv('CACHE_DIR', os.path.join(OUTPUT_DIR, 'cache'))
     MAX_PROJECTS = int(os.getenv('MAX_PROJECTS', '5000'))
     
     # 项目筛选条件
@@ -33,23 +37,31 @@ class Config:
     MIN_COMMITS = 50
     START_DATE = '2025-01-01T00:00:00Z'  # 2025年以来
     
-    # 数据库连接字符串
-    @property
+    # 数据库连接字符串，配置在导入时读取后不再变化，首次访问后缓存
+    @functools.cached_property
     def DB_CONNECTION_STRING(self):
         return {
             'host': self.DB_HOST,
             'user': self.DB_USER,
             'password': self.DB_PASSWORD,
             'database': self.DB_NAME,
-            'port': self.DB_PORT
+            'port': self.DB_PORT,
+            'charset': 'utf8mb4',
+            'connect_timeout': 10
         }
     
     @staticmethod
     def ensure_output_directory():
-        """确保输出目录存在"""
-        if not os.path.exists(Config.OUTPUT_DIR):
+        """确保输出目录存在
+        
+        每次调用都直接尝试创建（运行期间目录可能被删除），目录已存在时makedirs抛出FileExistsError，
+        只需一次系统调用，与其他进程同时创建时也不会出错
+        """
+        try:
             os.makedirs(Config.OUTPUT_DIR)
             logger.info(f"创建输出目录: {Config.OUTPUT_DIR}")
+        except FileExistsError:
+            pass
 
 # 创建全局配置实例
 config = Config()
\ No newline at end of file
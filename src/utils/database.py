@@ -1,9 +1,69 @@
 import pymysql
 import logging
+import queue
+import re
+import threading
+import time
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+# 连接空闲超过该秒数后，使用前先检查是否仍然可用（服务端可能已按wait_timeout断开）
+CONNECTION_CHECK_INTERVAL = 60
+
+# 允许直接拼接进SQL的表名格式
+TABLE_NAME_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+# 批量执行时每批的最大行数，避免拼接出的语句超过max_allowed_packet
+EXECUTE_MANY_BATCH_SIZE = 1000
+
+# init.sql只在新建数据库卷时执行，之后新增的结构由ensure_schema补齐到已有数据库，定义需与init.sql保持一致
+# 需要补齐的列：(表名, 列名, 列定义)
+SCHEMA_COLUMNS = [
+    ('projects', 'created_month', "CHAR(7) AS (DATE_FORMAT(created_at, '%Y-%m')) STORED"),
+    ('projects', 'updated_month', "CHAR(7) AS (DATE_FORMAT(updated_at, '%Y-%m')) STORED"),
+    ('mv_refresh_log', 'fingerprint', 'CHAR(40)'),
+]
+
+# 需要补齐的表
+SCHEMA_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS mv_language_stats (
+        language_name VARCHAR(50) PRIMARY KEY,
+        project_count INT NOT NULL,
+        total_percentage DOUBLE,
+        avg_stars DOUBLE,
+        avg_forks DOUBLE,
+        refreshed_at DATETIME NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS mv_domain_counts (
+        domain VARCHAR(50) PRIMARY KEY,
+        project_count INT NOT NULL,
+        refreshed_at DATETIME NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS mv_refresh_log (
+        id TINYINT PRIMARY KEY,
+        refreshed_at DATETIME NOT NULL,
+        fingerprint CHAR(40)
+    )
+    """,
+]
+
+# 需要补齐的索引：(表名, 索引名, 索引列)
+SCHEMA_INDEXES = [
+    ('projects', 'idx_projects_created_at', 'created_at'),
+    ('projects', 'idx_projects_created_month', 'created_month'),
+    ('projects', 'idx_projects_updated_month', 'updated_month'),
+    ('projects', 'idx_projects_license_name', 'license_name'),
+    ('contributors', 'idx_contributors_company', 'company'),
+    ('contributors', 'idx_contributors_created_at', 'created_at'),
+    ('languages', 'idx_languages_language_project', 'language_name, project_id'),
+]
+
 class DatabaseManager:
     """数据库管理类"""
     
@@ -11,12 +71,51 @@ class DatabaseManager:
         # 延迟导入以避免循环依赖
         from .config import config
         self.connection_params = config.DB_CONNECTION_STRING
-        self.connection = None
+        # pymysql连接不是线程安全的，每个线程使用各自独立的连接
+        self._local = threading.local()
+        # 空闲连接池：线程断开时归还连接，供后续线程复用，避免重复建立连接
+        self._pool = queue.LifoQueue(maxsize=config.DB_POOL_SIZE)
+        # 本管理器创建的全部未关闭连接（包括各线程正在使用的和池中空闲的），供close_all统一关闭
+        self._connections = set()
+        self._connections_lock = threading.Lock()
+    
+    @property
+    def connection(self):
+        """当前线程的数据库连接"""
+        return getattr(self._local, 'connection', None)
+    
+    @connection.setter
+    def connection(self, value):
+        self._local.connection = value
     
     def connect(self):
-        """建立数据库连接"""
+        """为当前线程获取数据库连接，优先复用连接池中的空闲连接"""
+        if self.connection:
+            if self.connection.open:
+                return self.connection
+            self._forget_connection(self.connection)
+        
         try:
+            while True:
+                try:
+                    conn, last_used = self._pool.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    if time.time() - last_used > CONNECTION_CHECK_INTERVAL:
+                        conn.ping(reconnect=True)
+                except pymysql.MySQLError:
+                    # 重连失败时连接已被关闭，直接丢弃
+                    self._forget_connection(conn)
+                    continue
+                self.connection = conn
+                self._local.last_used = last_used
+                return conn
+            
             self.connection = pymysql.connect(**self.connection_params)
+            self._local.last_used = time.time()
+            with self._connections_lock:
+                self._connections.add(self.connection)
             logger.info(f"成功连接到数据库: {self.connection_params['host']}:{self.connection_params['port']}/{self.connection_params['database']}")
             return self.connection
         except pymysql.MySQLError as e:
@@ -24,16 +123,55 @@ class DatabaseManager:
             raise
     
     def disconnect(self):
-        """关闭数据库连接"""
-        if self.connection:
-            self.connection.close()
-            logger.info("数据库连接已关闭")
+        """释放当前线程的数据库连接，连接池未满时归还以便复用，否则关闭"""
+        conn = self.connection
+        if not conn:
+            return
+        self.connection = None
+        if conn.open:
+            try:
+                self._pool.put_nowait((conn, getattr(self._local, 'last_used', 0)))
+                return
+            except queue.Full:
+                pass
+            conn.close()
+        self._forget_connection(conn)
+        logger.info("数据库连接已关闭")
+    
+    def _forget_connection(self, conn):
+        """从已创建连接的记录中移除已关闭的连接"""
+        with self._connections_lock:
+            self._connections.discard(conn)
+    
+    def close_all(self):
+        """关闭本管理器创建的所有连接
+        
+        包括连接池中的空闲连接和其他线程仍持有的连接，应在所有工作线程结束后调用（例如程序退出时）。
+        之后任一线程再次访问数据库时会重新建立连接。
+        """
+        self.connection = None
+        while True:
+            try:
+                self._pool.get_nowait()
+            except queue.Empty:
+                break
+        with self._connections_lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        for conn in connections:
+            if conn.open:
+                conn.close()
+        logger.info(f"已关闭全部 {len(connections)} 个数据库连接")
     
     @contextmanager
     def get_cursor(self, cursor_type=pymysql.cursors.DictCursor):
         """获取数据库游标上下文管理器"""
-        if not self.connection:
+        if not self.connection or not self.connection.open:
+            # 尚未连接，或连接已被close_all关闭
             self.connect()
+        elif time.time() - getattr(self._local, 'last_used', 0) > CONNECTION_CHECK_INTERVAL:
+            # 空闲较久的连接可能已断开，检查并在需要时自动重连
+            self.connection.ping(reconnect=True)
         
         try:
             with self.connection.cursor(cursor_type) as cursor:
@@ -43,6 +181,43 @@ class DatabaseManager:
             self.connection.rollback()
             logger.error(f"数据库操作失败: {e}")
             raise
+        finally:
+            self._local.last_used = time.time()
+    
+    def ensure_schema(self):
+        """补齐已有数据库中缺少的列、表和索引
+        
+        可重复执行：缺少的表直接创建，再从information_schema读取当前库已有的列和索引，只创建缺少的部分。
+        先建表再读取列，已有的表中后续新增的列（如mv_refresh_log.fingerprint）同样能被补齐。
+        """
+        try:
+            with self.get_cursor() as cursor:
+                for statement in SCHEMA_TABLES:
+                    cursor.execute(statement)
+                
+                cursor.execute("""
+                SELECT TABLE_NAME, COLUMN_NAME FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE()
+                """)
+                columns = {(row['TABLE_NAME'], row['COLUMN_NAME']) for row in cursor.fetchall()}
+                cursor.execute("""
+                SELECT DISTINCT TABLE_NAME, INDEX_NAME FROM information_schema.STATISTICS
+                WHERE TABLE_SCHEMA = DATABASE()
+                """)
+                indexes = {(row['TABLE_NAME'], row['INDEX_NAME']) for row in cursor.fetchall()}
+                
+                for table_name, column_name, definition in SCHEMA_COLUMNS:
+                    if (table_name, column_name) not in columns:
+                        logger.info(f"为表 {table_name} 添加列 {column_name}")
+                        cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {definition}")
+                
+                for table_name, index_name, index_columns in SCHEMA_INDEXES:
+                    if (table_name, index_name) not in indexes:
+                        logger.info(f"为表 {table_name} 创建索引 {index_name}")
+                        cursor.execute(f"CREATE INDEX {index_name} ON {table_name}({index_columns})")
+        except pymysql.MySQLError as e:
+            logger.error(f"更新数据库结构失败: {e}")
+            raise
     
     def execute_query(self, query, params=None, cursor_type=pymysql.cursors.DictCursor, fetch_all=True):
         """执行SQL查询
@@ -53,7 +228,7 @@ class DatabaseManager:
             cursor_type: 游标类型
             fetch_all: 是否一次性获取所有结果
                       - True: 返回所有结果列表（默认行为，兼容性好）
-                      - False: 返回生成器，流式获取结果，节省内存
+                      - False: 返回生成器，逐行返回已获取的结果
                       - 'generator': 同False，返回生成器
                       - 'yield': 同False，返回生成器
         
@@ -70,7 +245,7 @@ class DatabaseManager:
                 if fetch_all is True:
                     return cursor.fetchall()
                 else:
-                    # 流式获取结果，返回生成器
+                    # 逐行返回结果的生成器
                     def result_generator():
                         while True:
                             row = cursor.fetchone()
@@ -82,23 +257,71 @@ class DatabaseManager:
             else:
                 return cursor.rowcount
     
-    def execute_many(self, query, params_list):
-        """批量执行SQL查询"""
+    def execute_query_column(self, query, params=None):
+        """执行SQL查询并返回第一列的值列表
+        
+        使用元组游标，避免为每一行结果构建字典，适合只需要单列数据的大结果集
+        
+        Args:
+            query: SQL查询语句
+            params: 查询参数
+        
+        Returns:
+            list: 第一列的值列表
+        """
+        with self.get_cursor(pymysql.cursors.Cursor) as cursor:
+            cursor.execute(query, params)
+            return [row[0] for row in cursor.fetchall()]
+    
+    def execute_many(self, query, params_list, batch_size=EXECUTE_MANY_BATCH_SIZE):
+        """批量执行SQL查询
+        
+        按batch_size分批调用executemany，避免一次拼接出超过max_allowed_packet的大语句
+        
+        Args:
+            query: SQL语句
+            params_list: 参数列表
+            batch_size: 每批的最大行数
+        
+        Returns:
+            int: 受影响的总行数
+        """
+        total = 0
         with self.get_cursor() as cursor:
-            cursor.executemany(query, params_list)
-            return cursor.rowcount
+            for i in range(0, len(params_list), batch_size):
+                cursor.executemany(query, params_list[i:i + batch_size])
+                total += cursor.rowcount
+        return total
     
     def is_table_empty(self, table_name):
-        """检查表是否为空"""
-        query = f"SELECT COUNT(*) as count FROM {table_name}"
-        result = self.execute_query(query)
-        return result[0]['count'] == 0
+        """检查表是否为空
+        
+        只探测是否存在一行，避免COUNT(*)在InnoDB上扫描整个索引
+        
+        Raises:
+            ValueError: 表名不合法
+        """
+        if not TABLE_NAME_RE.match(table_name):
+            logger.error(f"非法的表名: {table_name}")
+            raise ValueError(f"非法的表名: {table_name}")
+        result = self.execute_query(f"SELECT 1 FROM {table_name} LIMIT 1")
+        return not result
     
-    def get_last_insert_id(self):
-        """获取最后插入的ID"""
+    def execute_insert(self, query, params=None):
+        """执行INSERT语句并返回新插入行的ID
+        
+        直接读取执行语句的游标的lastrowid，无需再查询LAST_INSERT_ID()
+        
+        Args:
+            query: INSERT语句
+            params: 查询参数
+        
+        Returns:
+            int: 新插入行的自增ID
+        """
         with self.get_cursor() as cursor:
-            cursor.execute("SELECT LAST_INSERT_ID()")
-            return cursor.fetchone()['LAST_INSERT_ID()']
+            cursor.execute(query, params)
+            return cursor.lastrowid
 
 # 创建全局数据库管理器实例
 db_manager = DatabaseManager()
\ No newline at end of file
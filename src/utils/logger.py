@@ -1,14 +1,35 @@
 import logging
 import os
 from datetime import datetime
+from logging.handlers import RotatingFileHandler
 
 # 避免循环导入，在需要时再导入config
 
+# 单个日志文件的最大字节数及保留的备份数量
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 5
+
 class LoggerManager:
     """日志管理类"""
     
-    @staticmethod
-    def get_logger(name, log_file=None):
+    # 所有日志记录器共用的格式器和控制台处理器
+    _formatter = None
+    _console_handler = None
+    
+    @classmethod
+    def _get_console_handler(cls, log_level):
+        """获取共享的控制台处理器，首次调用时创建"""
+        if cls._console_handler is None:
+            cls._formatter = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            )
+            cls._console_handler = logging.StreamHandler()
+            cls._console_handler.setLevel(log_level)
+            cls._console_handler.setFormatter(cls._formatter)
+        return cls._console_handler
+    
+    @classmethod
+    def get_logger(cls, name, log_file=None):
         """获取日志记录器
         
         Args:
@@ -31,34 +52,31 @@ class LoggerManager:
         log_level = getattr(logging, getattr(config, 'LOG_LEVEL', 'INFO'), logging.INFO)
         logger.setLevel(log_level)
         
-        # 创建格式器
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        
-        # 创建控制台处理器
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(log_level)
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        # 添加共享的控制台处理器
+        logger.addHandler(cls._get_console_handler(log_level))
         
         # 创建文件处理器（如果指定了日志文件）
         if log_file:
             # 确保输出目录存在
-            if not os.path.exists(config.OUTPUT_DIR):
-                os.makedirs(config.OUTPUT_DIR)
-                logging.info(f"创建输出目录: {config.OUTPUT_DIR}")
+            config.ensure_output_directory()
             
             log_path = os.path.join(config.OUTPUT_DIR, log_file)
-            file_handler = logging.FileHandler(log_path, encoding='utf-8')
+            # 首次写入时才打开文件；每条记录立即写入，便于tail -f查看，进程异常退出也不丢失日志
+            file_handler = RotatingFileHandler(
+                log_path,
+                maxBytes=LOG_FILE_MAX_BYTES,
+                backupCount=LOG_FILE_BACKUP_COUNT,
+                encoding='utf-8',
+                delay=True
+            )
             file_handler.setLevel(log_level)
-            file_handler.setFormatter(formatter)
+            file_handler.setFormatter(cls._formatter)
             logger.addHandler(file_handler)
         
         return logger
     
-    @staticmethod
-    def get_date_logger(name):
+    @classmethod
+    def get_date_logger(cls, name):
         """获取带日期的日志记录器
         
         Args:
@@ -69,7 +87,7 @@ class LoggerManager:
         """
         today = datetime.now().strftime('%Y-%m-%d')
         log_file = f"{name}_{today}.log"
-        return LoggerManager.get_logger(name, log_file)
+        return cls.get_logger(name, log_file)
 
 # 创建常用日志记录器
 data_collection_logger = LoggerManager.get_logger('data_collection')
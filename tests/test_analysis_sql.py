@@ -0,0 +1,320 @@
+"""分析SQL改写的回归测试（需要MySQL 8）
+
+在临时数据库中按init.sql建表并写入随机数据，分别执行原实现的SQL与DataAnalyzer的新实现，比较两者的结果。
+
+通过环境变量TEST_DB_HOST指定测试用的MySQL服务器（可选TEST_DB_PORT、TEST_DB_USER、TEST_DB_PASSWORD），
+未配置时跳过；测试会创建并在结束后删除一个临时数据库。
+"""
+import os
+import random
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+pymysql = pytest.importorskip('pymysql')
+
+from src.data_processing.data_analyzer import DataAnalyzer
+from src.utils.database import DatabaseManager
+
+from tests.test_data_analyzer import old_age_range, old_domain_counts
+
+pytestmark = pytest.mark.skipif(not os.getenv('TEST_DB_HOST'), reason='未配置TEST_DB_HOST，跳过需要MySQL的测试')
+
+INIT_SQL = Path(__file__).resolve().parent.parent / 'init.sql'
+
+DESCRIPTION_WORDS = [
+    'web', 'Website', 'FRONTEND', 'mobile', 'Android', 'app', 'ML', 'Machine Learning', 'neural', 'data',
+    'Big Data', 'docker', 'CI/CD', 'cloud', 'security', 'Auth', '3D', 'Unity', 'cli', 'Command Line', 'IDE',
+    'library', 'for', 'the', 'fast', 'simple', '中文', 'résumé',
+]
+
+
+def old_correlation(rows):
+    """原实现：取出全部行后用pandas计算皮尔逊相关系数"""
+    if not rows:
+        return 0
+    df = pd.DataFrame(rows)
+    correlation = df['stargazers_count'].corr(df['forks_count'])
+    return float(correlation) if not pd.isna(correlation) else 0
+
+
+def counts_by(rows, label_key):
+    """原查询没有ORDER BY，按标签比较各组的计数"""
+    return {item[label_key]: item['project_count'] for item in rows}
+
+
+@pytest.fixture(scope='module')
+def db():
+    params = {
+        'host': os.getenv('TEST_DB_HOST'),
+        'port': int(os.getenv('TEST_DB_PORT', '3306')),
+        'user': os.getenv('TEST_DB_USER', 'root'),
+        'password': os.getenv('TEST_DB_PASSWORD', ''),
+        'charset': 'utf8mb4',
+    }
+    database = f'analyze_github_test_{os.getpid()}'
+
+    admin = pymysql.connect(**params, autocommit=True)
+    with admin.cursor() as cursor:
+        cursor.execute(f'CREATE DATABASE {database} CHARACTER SET utf8mb4')
+
+    manager = DatabaseManager()
+    manager.connection_params = {**params, 'database': database}
+    try:
+        with manager.get_cursor() as cursor:
+            for statement in INIT_SQL.read_text(encoding='utf-8').split(';'):
+                if statement.strip():
+                    cursor.execute(statement)
+        _seed(manager)
+        yield manager
+    finally:
+        manager.close_all()
+        with admin.cursor() as cursor:
+            cursor.execute(f'DROP DATABASE IF EXISTS {database}')
+        admin.close()
+
+
+def _seed(manager):
+    rng = random.Random(2024)
+    now = manager.execute_query('SELECT NOW() as now')[0]['now']
+
+    projects = []
+    for i in range(1, 801):
+        # 避开整天边界附近的时间，项目年龄按天取整时不受测试执行时刻影响
+        created_at = now - timedelta(days=rng.randint(-3, 3000), hours=rng.choice([-6, 6]))
+        updated_at = created_at + timedelta(days=rng.randint(0, 400))
+        description = rng.choice([None, '', ' '.join(rng.choice(DESCRIPTION_WORDS) for _ in range(rng.randint(1, 6)))])
+        projects.append((
+            i, f'project{i}', f'owner/project{i}', description,
+            created_at if rng.random() > 0.05 else None,
+            updated_at if rng.random() > 0.05 else None,
+            rng.randint(0, 100000), rng.randint(0, 20000),
+            rng.choice([None, rng.randint(0, 1500)]), rng.choice([None, rng.randint(0, 150)]),
+        ))
+    manager.execute_many("""
+        INSERT INTO projects (id, name, full_name, description, created_at, updated_at,
+                              stargazers_count, forks_count, open_issues_count, contributors_count)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """, projects)
+
+    manager.execute_many(
+        "INSERT INTO statistics (project_id, total_commits) VALUES (%s, %s)",
+        [(i, rng.choice([None, rng.randint(0, 800)])) for i in range(1, 701)]
+    )
+
+    languages = []
+    for i in range(1, 801):
+        for language in rng.sample(['Python', 'Go', 'Rust', 'C', 'Java', 'TypeScript', 'Ruby', 'Zig', 'PHP', 'Lua', 'Kotlin', 'Swift'], rng.randint(0, 4)):
+            languages.append((i, language, rng.randint(1, 10 ** 6), rng.uniform(0, 100)))
+    manager.execute_many(
+        "INSERT INTO languages (project_id, language_name, bytes_count, percentage) VALUES (%s, %s, %s, %s)",
+        languages
+    )
+
+
+@pytest.fixture
+def analyzer(db):
+    analyzer = DataAnalyzer()
+    analyzer.db_manager = db
+    analyzer.refresh_summary_tables()
+    return analyzer
+
+
+def test_activity_levels_match_old_case(db, analyzer):
+    result = analyzer.analyze_project_lifecycle()
+
+    activity_data = db.execute_query("""
+        SELECT
+            CASE
+                WHEN s.total_commits > 500 THEN '非常活跃'
+                WHEN s.total_commits > 200 THEN '活跃'
+                WHEN s.total_commits > 50 THEN '一般'
+                ELSE '低活跃'
+            END as activity_level,
+            COUNT(*) as project_count
+        FROM statistics s
+        GROUP BY activity_level
+        """)
+    assert counts_by(result['activity_levels'], 'activity_level') == counts_by(activity_data, 'activity_level')
+
+
+def test_community_buckets_match_old_case(db, analyzer):
+    result = analyzer.analyze_community_health()
+
+    contributor_dist = db.execute_query("""
+        SELECT
+            CASE
+                WHEN contributors_count > 100 THEN '100+ 贡献者'
+                WHEN contributors_count > 50 THEN '50-100 贡献者'
+                WHEN contributors_count > 20 THEN '20-50 贡献者'
+                WHEN contributors_count > 10 THEN '10-20 贡献者'
+                ELSE '少于10贡献者'
+            END as contributor_range,
+            COUNT(*) as project_count
+        FROM projects
+        GROUP BY contributor_range
+        """)
+    issues_dist = db.execute_query("""
+        SELECT
+            CASE
+                WHEN open_issues_count > 1000 THEN '1000+ issues'
+                WHEN open_issues_count > 500 THEN '500-1000 issues'
+                WHEN open_issues_count > 100 THEN '100-500 issues'
+                WHEN open_issues_count > 50 THEN '50-100 issues'
+                ELSE '少于50 issues'
+            END as issues_range,
+            COUNT(*) as project_count
+        FROM projects
+        GROUP BY issues_range
+        """)
+    assert counts_by(result['contributor_distribution'], 'contributor_range') == \
+        counts_by(contributor_dist, 'contributor_range')
+    assert counts_by(result['issues_distribution'], 'issues_range') == counts_by(issues_dist, 'issues_range')
+
+
+def test_project_age_distribution_matches_old(db, analyzer):
+    result = analyzer.analyze_project_lifecycle()
+
+    now = db.execute_query('SELECT NOW() as now')[0]['now']
+    age_counts = Counter(
+        old_age_range((now - item['created_at']).days)
+        for item in db.execute_query('SELECT created_at FROM projects WHERE created_at IS NOT NULL')
+    )
+    assert result['age_distribution'] == [
+        {'range': age_range, 'count': age_counts[age_range]}
+        for age_range in ('0-1年', '1-2年', '2-3年', '3-5年', '5年以上')
+    ]
+
+
+def test_stars_forks_correlation_matches_pandas(db, analyzer):
+    result = analyzer.analyze_community_health()
+
+    rows = db.execute_query('SELECT stargazers_count, forks_count FROM projects')
+    assert result['stars_forks_correlation'] == pytest.approx(old_correlation(rows), abs=1e-9)
+
+
+def test_domain_counts_match_old_substrings(db, analyzer):
+    descriptions = db.execute_query_column("""
+        SELECT description
+        FROM projects
+        WHERE description IS NOT NULL AND description != ''
+        """)
+
+    with db.get_cursor() as cursor:
+        assert analyzer._count_domain_keywords(cursor) == old_domain_counts(descriptions)
+
+
+def test_domain_keywords_match_old_ranking(db, analyzer):
+    descriptions = db.execute_query_column("""
+        SELECT description
+        FROM projects
+        WHERE description IS NOT NULL AND description != ''
+        """)
+    expected = sorted(
+        [{'domain': domain, 'count': count} for domain, count in old_domain_counts(descriptions).items()],
+        key=lambda x: x['count'],
+        reverse=True
+    )
+
+    assert analyzer._extract_domain_keywords() == expected
+
+
+def test_lifecycle_month_trends_match_old_queries(db, analyzer):
+    result = analyzer.analyze_project_lifecycle()
+
+    creation_data = db.execute_query("""
+        SELECT DATE_FORMAT(created_at, '%Y-%m') as month, COUNT(*) as project_count
+        FROM projects
+        GROUP BY month
+        ORDER BY month
+        """)
+    update_data = db.execute_query("""
+        SELECT DATE_FORMAT(updated_at, '%Y-%m') as month, COUNT(*) as updated_count
+        FROM projects
+        GROUP BY month
+        ORDER BY month
+        """)
+    assert result['creation_trend'] == creation_data
+    assert result['update_trend'] == update_data
+
+
+def test_language_stats_match_old_queries(db, analyzer):
+    result = analyzer.analyze_programming_languages()
+
+    language_data = db.execute_query("""
+        SELECT l.language_name, COUNT(DISTINCT l.project_id) as project_count,
+               SUM(l.percentage) as total_percentage
+        FROM languages l
+        GROUP BY l.language_name
+        ORDER BY project_count DESC
+        """)
+    total_projects = sum(item['project_count'] for item in language_data)
+    assert result['total_projects'] == total_projects
+    assert result['total_languages'] == len(language_data)
+
+    expected = {item['language_name']: item for item in language_data}
+    for item in result['top_languages']:
+        old = expected[item['language_name']]
+        assert item['project_count'] == old['project_count']
+        assert item['total_percentage'] == pytest.approx(old['total_percentage'])
+        assert item['percentage'] == (old['project_count'] / total_projects) * 100
+    assert [item['project_count'] for item in result['top_languages']] == \
+        [item['project_count'] for item in language_data[:10]]
+
+    # 汇总表中的平均值为DOUBLE，原查询的AVG返回DECIMAL，按数值比较
+    for column, source, key in (
+        ('avg_stars', 'stargazers_count', 'languages_by_stars'),
+        ('avg_forks', 'forks_count', 'languages_by_forks'),
+    ):
+        old_values = db.execute_query(f"""
+            SELECT l.language_name, AVG(p.{source}) as {column}
+            FROM languages l
+            JOIN projects p ON l.project_id = p.id
+            GROUP BY l.language_name
+            ORDER BY {column} DESC
+            LIMIT 10
+            """)
+        assert [item[column] for item in result[key]] == \
+            pytest.approx([float(item[column]) for item in old_values], abs=1e-4)
+
+
+def test_summary_tables_refresh_when_source_data_changes(db, analyzer):
+    fingerprint = analyzer._data_fingerprint(analyzer._get_data_counts())
+    assert analyzer._get_summary_refresh_state()['fingerprint'] == fingerprint
+
+    db.execute_query(
+        "INSERT INTO languages (project_id, language_name, bytes_count, percentage) VALUES (1, 'Fortran', 1, 1.0)"
+    )
+    try:
+        new_fingerprint = analyzer._data_fingerprint(analyzer._get_data_counts())
+        assert new_fingerprint != fingerprint
+
+        analyzer._ensure_summary_tables(new_fingerprint)
+
+        assert analyzer._get_summary_refresh_state()['fingerprint'] == new_fingerprint
+        assert db.execute_query_column(
+            "SELECT project_count FROM mv_language_stats WHERE language_name = 'Fortran'"
+        ) == [1]
+    finally:
+        db.execute_query("DELETE FROM languages WHERE language_name = 'Fortran'")
+        analyzer.refresh_summary_tables()
+
+
+def test_project_domains_refresh_when_descriptions_change(db, analyzer):
+    before = {item['domain']: item['count'] for item in analyzer.analyze_project_domains()['domain_keywords']}
+
+    db.execute_query(
+        "INSERT INTO projects (id, name, full_name, description) VALUES (9001, 'extra', 'owner/extra', 'docker game')"
+    )
+    try:
+        after = {item['domain']: item['count'] for item in analyzer.analyze_project_domains()['domain_keywords']}
+
+        assert after['devops'] == before['devops'] + 1
+        assert after['game'] == before['game'] + 1
+        assert after['web'] == before['web']
+    finally:
+        db.execute_query("DELETE FROM projects WHERE id = 9001")
+        analyzer.refresh_summary_tables()
@@ -0,0 +1,436 @@
+"""DataAnalyzer回归测试（不依赖数据库）
+
+分桶边界、相关系数、关键词匹配等逻辑与原实现（CASE分支、pandas相关系数、逐个子串匹配）逐一比对；
+需要在MySQL中执行的SQL改写见test_analysis_sql.py。
+"""
+import bisect
+import os
+import random
+import re
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from src.data_processing.data_analyzer import (
+    ACTIVITY_BUCKETS,
+    CONTRIBUTOR_BUCKETS,
+    DOMAIN_KEYWORDS,
+    FEMALE_NAME_PATTERNS,
+    ISSUES_BUCKETS,
+    MALE_NAME_PATTERNS,
+    PROJECT_AGE_BUCKETS,
+    DataAnalyzer,
+    _bucket_index_sql,
+)
+
+
+def interval_bucket(value, bounds):
+    """按MySQL的GREATEST(INTERVAL(value, bounds...), 0)计算桶序号"""
+    if value is None:
+        return 0
+    return bisect.bisect_right(bounds, value)
+
+
+def old_activity_level(total_commits):
+    if total_commits is None:
+        return '低活跃'
+    if total_commits > 500:
+        return '非常活跃'
+    if total_commits > 200:
+        return '活跃'
+    if total_commits > 50:
+        return '一般'
+    return '低活跃'
+
+
+def old_contributor_range(contributors_count):
+    if contributors_count is None:
+        return '少于10贡献者'
+    if contributors_count > 100:
+        return '100+ 贡献者'
+    if contributors_count > 50:
+        return '50-100 贡献者'
+    if contributors_count > 20:
+        return '20-50 贡献者'
+    if contributors_count > 10:
+        return '10-20 贡献者'
+    return '少于10贡献者'
+
+
+def old_issues_range(open_issues_count):
+    if open_issues_count is None:
+        return '少于50 issues'
+    if open_issues_count > 1000:
+        return '1000+ issues'
+    if open_issues_count > 500:
+        return '500-1000 issues'
+    if open_issues_count > 100:
+        return '100-500 issues'
+    if open_issues_count > 50:
+        return '50-100 issues'
+    return '少于50 issues'
+
+
+def old_age_range(age_days):
+    age_years = age_days / 365.25
+    if age_years < 1:
+        return '0-1年'
+    if age_years < 2:
+        return '1-2年'
+    if age_years < 3:
+        return '2-3年'
+    if age_years < 5:
+        return '3-5年'
+    return '5年以上'
+
+
+def old_domain_counts(descriptions):
+    counts = {domain: 0 for domain in DOMAIN_KEYWORDS}
+    for description in descriptions:
+        if description:
+            desc_lower = description.lower()
+            for domain, keywords in DOMAIN_KEYWORDS.items():
+                if any(keyword in desc_lower for keyword in keywords):
+                    counts[domain] += 1
+    return counts
+
+
+class FakeDatabaseManager:
+    """按查询中的关键字返回预设结果"""
+
+    def __init__(self, results):
+        self.results = results
+        self.queries = []
+
+    def execute_query(self, query, params=None):
+        self.queries.append(query)
+        for keyword, rows in self.results.items():
+            if keyword in query:
+                return rows
+        raise AssertionError(f"未预设结果的查询: {query}")
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    analyzer = DataAnalyzer()
+    # 综合分析结果缓存写入临时目录
+    analyzer.cache_dir = str(tmp_path / 'analysis')
+    return analyzer
+
+
+@pytest.mark.parametrize('buckets, old_label, values', [
+    (ACTIVITY_BUCKETS, old_activity_level, [None, -1, 0, 50, 51, 200, 201, 500, 501, 10 ** 6]),
+    (CONTRIBUTOR_BUCKETS, old_contributor_range, [None, -1, 0, 10, 11, 20, 21, 50, 51, 100, 101, 10 ** 6]),
+    (ISSUES_BUCKETS, old_issues_range, [None, -1, 0, 50, 51, 100, 101, 500, 501, 1000, 1001, 10 ** 6]),
+])
+def test_interval_buckets_match_old_case(buckets, old_label, values):
+    bounds, labels = buckets
+    for value in list(values) + list(range(0, 1200)):
+        assert labels[interval_bucket(value, bounds)] == old_label(value), value
+
+
+def test_project_age_buckets_match_old_years():
+    bounds, labels = PROJECT_AGE_BUCKETS
+    for age_days in range(-5, 4000):
+        assert labels[interval_bucket(age_days, bounds)] == old_age_range(age_days), age_days
+
+
+def test_bucket_index_sql():
+    assert _bucket_index_sql('s.total_commits', (51, 201, 501)) == 'GREATEST(INTERVAL(s.total_commits, 51, 201, 501), 0)'
+
+
+def test_correlation_from_sums_matches_pandas(analyzer):
+    rng = random.Random(7)
+    datasets = [
+        [(rng.randint(0, 200000), rng.randint(0, 50000)) for _ in range(500)],
+        [(x, x * 3 + rng.randint(-5, 5)) for x in range(1000, 2000)],
+        [(x, 10 ** 6 - x) for x in range(100)],
+        [(10 ** 9 + rng.randint(0, 10), 10 ** 9 + rng.randint(0, 10)) for _ in range(200)],
+        [(1, 2), (3, 4)],
+    ]
+    for data in datasets:
+        stars, forks = zip(*data)
+        sums = {
+            'n': len(data),
+            'sx': sum(stars),
+            'sy': sum(forks),
+            'sxy': sum(x * y for x, y in data),
+            'sxx': sum(x * x for x in stars),
+            'syy': sum(y * y for y in forks),
+        }
+        expected = pd.Series(stars, dtype=float).corr(pd.Series(forks, dtype=float))
+        assert analyzer._correlation_from_sums(sums) == pytest.approx(expected, abs=1e-9)
+
+
+@pytest.mark.parametrize('sums', [
+    {'n': 0, 'sx': None, 'sy': None, 'sxy': None, 'sxx': None, 'syy': None},
+    {'n': 1, 'sx': 5, 'sy': 3, 'sxy': 15, 'sxx': 25, 'syy': 9},
+    # 星标数全部相同，方差为0，原实现中pandas返回NaN后转为0
+    {'n': 3, 'sx': 30, 'sy': 6, 'sxy': 60, 'sxx': 300, 'syy': 14},
+])
+def test_correlation_from_sums_degenerate(analyzer, sums):
+    assert analyzer._correlation_from_sums(sums) == 0
+
+
+def test_estimate_gender_matches_old(analyzer):
+    rng = random.Random(11)
+    fragments = FEMALE_NAME_PATTERNS + MALE_NAME_PATTERNS + ['x', 'dev', '42', '_', 'an', 'jo', 'tomas', 'marian']
+    usernames = [''.join(rng.choice(fragments) for _ in range(rng.randint(1, 3))) for _ in range(3000)]
+
+    expected = {'男性': 0, '女性': 0, '未知': 0}
+    for username in usernames:
+        is_female = any(pattern in username for pattern in FEMALE_NAME_PATTERNS)
+        is_male = any(pattern in username for pattern in MALE_NAME_PATTERNS)
+        if is_female and not is_male:
+            expected['女性'] += 1
+        elif is_male and not is_female:
+            expected['男性'] += 1
+        else:
+            expected['未知'] += 1
+
+    assert analyzer._estimate_gender(usernames) == [
+        {'gender': gender, 'count': count} for gender, count in expected.items()
+    ]
+
+
+def test_domain_patterns_match_old_substrings(analyzer):
+    descriptions = [
+        None, '', 'A Web framework', 'WEBSITE builder', 'Android APP', 'iOS client', 'HTML parser',
+        'Machine Learning toolkit', 'deep-learning', 'Big Data ANALYTICS', 'CI/CD pipelines', 'ci cd',
+        'Unity 3D engine', 'Command Line Interface', 'IDE plugin', 'authentication service', 'nothing here',
+        'Docker and Kubernetes on the Cloud', 'mail server', 'Résumé editor', 'STATISTICS', 'Neural nets',
+    ]
+    rng = random.Random(3)
+    words = [keyword for keywords in DOMAIN_KEYWORDS.values() for keyword in keywords] + ['foo', 'bar', ' ', '-']
+    for _ in range(2000):
+        description = ''.join(rng.choice(words) for _ in range(rng.randint(1, 5)))
+        descriptions.append(description.upper() if rng.random() < 0.3 else description)
+
+    patterns = {domain: re.compile(pattern, re.IGNORECASE) for domain, pattern in analyzer.domain_patterns.items()}
+    counts = {
+        domain: sum(1 for description in descriptions if description and pattern.search(description))
+        for domain, pattern in patterns.items()
+    }
+    assert counts == old_domain_counts(descriptions)
+
+
+def test_extract_domain_keywords_keeps_old_order(analyzer):
+    # 汇总表中的顺序与DOMAIN_KEYWORDS不同，且缺少部分领域
+    analyzer.db_manager = FakeDatabaseManager({
+        'mv_domain_counts': [
+            {'domain': 'tools', 'project_count': 5},
+            {'domain': 'game', 'project_count': 2},
+            {'domain': 'web', 'project_count': 2},
+            {'domain': 'mobile', 'project_count': 9},
+        ],
+    })
+    expected_counts = {domain: 0 for domain in DOMAIN_KEYWORDS}
+    expected_counts.update({'tools': 5, 'game': 2, 'web': 2, 'mobile': 9})
+    expected = sorted(
+        [{'domain': domain, 'count': count} for domain, count in expected_counts.items()],
+        key=lambda x: x['count'],
+        reverse=True
+    )
+
+    assert analyzer._extract_domain_keywords() == expected
+
+
+def test_project_lifecycle_splits_union_rows(analyzer):
+    analyzer.db_manager = FakeDatabaseManager({
+        'UNION ALL': [
+            {'kind': 'created', 'month': '2023-01', 'project_count': 3},
+            {'kind': 'created', 'month': '2024-05', 'project_count': 1},
+            {'kind': 'updated', 'month': None, 'project_count': 2},
+            {'kind': 'updated', 'month': '2024-06', 'project_count': 2},
+        ],
+        'TIMESTAMPDIFF': [{'bucket': 4, 'project_count': 7}, {'bucket': 0, 'project_count': 1}],
+        'statistics': [{'bucket': 0, 'project_count': 4}, {'bucket': 3, 'project_count': 1}],
+    })
+
+    result = analyzer.analyze_project_lifecycle()
+
+    assert result['creation_trend'] == [
+        {'month': '2023-01', 'project_count': 3},
+        {'month': '2024-05', 'project_count': 1},
+    ]
+    assert result['update_trend'] == [
+        {'month': None, 'updated_count': 2},
+        {'month': '2024-06', 'updated_count': 2},
+    ]
+    assert result['age_distribution'] == [
+        {'range': '0-1年', 'count': 1},
+        {'range': '1-2年', 'count': 0},
+        {'range': '2-3年', 'count': 0},
+        {'range': '3-5年', 'count': 0},
+        {'range': '5年以上', 'count': 7},
+    ]
+    assert result['activity_levels'] == [
+        {'activity_level': '低活跃', 'project_count': 4},
+        {'activity_level': '非常活跃', 'project_count': 1},
+    ]
+
+
+def test_community_health_sums_cross_buckets(analyzer):
+    analyzer.db_manager = FakeDatabaseManager({
+        'contributor_bucket': [
+            {'contributor_bucket': 0, 'issues_bucket': 0, 'project_count': 5},
+            {'contributor_bucket': 0, 'issues_bucket': 2, 'project_count': 1},
+            {'contributor_bucket': 4, 'issues_bucket': 0, 'project_count': 2},
+            {'contributor_bucket': 4, 'issues_bucket': 4, 'project_count': 3},
+        ],
+        'sxy': [{'n': 0, 'sx': None, 'sy': None, 'sxy': None, 'sxx': None, 'syy': None}],
+    })
+
+    result = analyzer.analyze_community_health()
+
+    assert result['contributor_distribution'] == [
+        {'contributor_range': '少于10贡献者', 'project_count': 6},
+        {'contributor_range': '100+ 贡献者', 'project_count': 5},
+    ]
+    assert result['issues_distribution'] == [
+        {'issues_range': '少于50 issues', 'project_count': 7},
+        {'issues_range': '100-500 issues', 'project_count': 1},
+        {'issues_range': '1000+ issues', 'project_count': 3},
+    ]
+    assert result['stars_forks_correlation'] == 0
+
+
+def test_data_fingerprint_changes_with_each_count():
+    counts = {
+        'total_projects': 10, 'total_contributors': 20, 'total_commits': Decimal('300'),
+        'last_updated': datetime(2024, 5, 1, 12, 0, 0), 'total_languages': 15, 'total_topics': 8,
+    }
+    fingerprint = DataAnalyzer._data_fingerprint(counts)
+    assert len(fingerprint) == 40
+    assert DataAnalyzer._data_fingerprint(dict(counts)) == fingerprint
+
+    for key, value in [('total_projects', 11), ('total_contributors', 19), ('total_commits', Decimal('301')),
+                       ('last_updated', datetime(2024, 5, 1, 12, 0, 1)), ('total_languages', 16), ('total_topics', 7)]:
+        assert DataAnalyzer._data_fingerprint({**counts, key: value}) != fingerprint, key
+
+
+@pytest.mark.parametrize('state, refreshed', [
+    ([], True),
+    ([{'refreshed_at': datetime(2024, 1, 1), 'fingerprint': None}], True),
+    ([{'refreshed_at': datetime(2024, 1, 1), 'fingerprint': 'b' * 40}], True),
+    ([{'refreshed_at': datetime(2024, 1, 1), 'fingerprint': 'a' * 40}], False),
+])
+def test_ensure_summary_tables_refreshes_on_fingerprint_change(analyzer, monkeypatch, state, refreshed):
+    analyzer.db_manager = FakeDatabaseManager({'mv_refresh_log': state})
+    calls = []
+    monkeypatch.setattr(analyzer, 'refresh_summary_tables', lambda fingerprint=None: calls.append(fingerprint))
+
+    analyzer._ensure_summary_tables('a' * 40)
+
+    assert calls == (['a' * 40] if refreshed else [])
+
+
+@pytest.mark.parametrize('ensure_summary', [True, False])
+def test_project_domains_checks_summary_fingerprint(analyzer, monkeypatch, ensure_summary):
+    counts = {
+        'total_projects': 3, 'total_contributors': 0, 'total_commits': 0,
+        'last_updated': datetime(2024, 5, 1), 'total_languages': 2, 'total_topics': 1,
+    }
+    analyzer.db_manager = FakeDatabaseManager({
+        'SELECT (SELECT COUNT(*) FROM projects)': [counts],
+        'topics': [{'topic_name': 'cli', 'project_count': 1}],
+        'mv_language_stats': [{'language_name': 'Go', 'project_count': 2}],
+        'license_name': [],
+        'mv_domain_counts': [{'domain': 'tools', 'project_count': 1}],
+    })
+    fingerprints = []
+    monkeypatch.setattr(analyzer, '_ensure_summary_tables', fingerprints.append)
+
+    result = analyzer.analyze_project_domains(ensure_summary=ensure_summary)
+
+    assert fingerprints == ([DataAnalyzer._data_fingerprint(counts)] if ensure_summary else [])
+    assert result['domain_keywords'][0] == {'domain': 'tools', 'count': 1}
+
+
+def stub_summary_analyses(analyzer, monkeypatch, counts):
+    """用预设结果替换各项分析，返回记录分析调用的列表"""
+    analyzer.db_manager = FakeDatabaseManager({'SELECT (SELECT COUNT(*) FROM projects)': [counts]})
+    analyzer.db_manager.disconnect = lambda: None
+    monkeypatch.setattr(analyzer, '_ensure_summary_tables', lambda fingerprint: None)
+    calls = []
+    for name in ('analyze_programming_languages', 'analyze_contributors', 'analyze_project_lifecycle',
+                 'analyze_community_health'):
+        monkeypatch.setattr(analyzer, name, lambda name=name: calls.append(name) or {'items': [{'name': name}]})
+    monkeypatch.setattr(analyzer, 'analyze_project_domains',
+                        lambda ensure_summary=True: calls.append('domains') or {'items': [{'name': 'domains'}]})
+    return calls
+
+
+SUMMARY_COUNTS = {
+    'total_projects': 3, 'total_contributors': 2, 'total_commits': Decimal('10'),
+    'last_updated': datetime(2024, 5, 1), 'total_languages': 2, 'total_topics': 1,
+}
+
+
+def test_generate_analysis_summary_cache_is_isolated(analyzer, monkeypatch):
+    calls = stub_summary_analyses(analyzer, monkeypatch, SUMMARY_COUNTS)
+
+    first = analyzer.generate_analysis_summary()
+    # 修改返回值中嵌套的列表和字典
+    first['languages']['items'].append({'name': 'extra'})
+    first['domains']['items'][0]['name'] = 'changed'
+    second = analyzer.generate_analysis_summary()
+    second['lifecycle']['items'].clear()
+    third = analyzer.generate_analysis_summary()
+
+    assert len(calls) == 5
+    assert third['languages'] == {'items': [{'name': 'analyze_programming_languages'}]}
+    assert third['domains'] == {'items': [{'name': 'domains'}]}
+    assert third['lifecycle'] == {'items': [{'name': 'analyze_project_lifecycle'}]}
+
+
+def test_summary_cache_file_round_trips_types(analyzer):
+    fingerprint = 'a' * 40
+    summary = {
+        'metadata': {'total_commits': Decimal('12345678901234567890'), 'analysis_date': '2024-05-01 12:00:00'},
+        'languages': {'top_languages': [{'language_name': 'Go', 'avg_stars': 1.5, 'total_projects': Decimal('7.25')}]},
+        'contributors': {'top_contributors': [{'username': '中文', 'created_at': datetime(2020, 1, 2, 3, 4, 5)}]},
+        'lifecycle': {'first_day': date(2021, 3, 4), 'missing': None},
+    }
+
+    analyzer._save_cached_summary(fingerprint, summary)
+
+    assert os.listdir(analyzer.cache_dir) == [f'summary_{fingerprint}.json']
+    loaded = analyzer._load_cached_summary(fingerprint)
+    assert loaded == summary
+    assert isinstance(loaded['metadata']['total_commits'], Decimal)
+    assert isinstance(loaded['contributors']['top_contributors'][0]['created_at'], datetime)
+    assert type(loaded['lifecycle']['first_day']) is date
+
+
+def test_summary_cache_honours_ttl_and_version(analyzer, monkeypatch):
+    calls = stub_summary_analyses(analyzer, monkeypatch, SUMMARY_COUNTS)
+    analyzer.generate_analysis_summary()
+    fingerprint = DataAnalyzer._data_fingerprint(SUMMARY_COUNTS)
+    cache_path = analyzer._summary_cache_path(fingerprint)
+
+    # 新的分析器实例（例如新启动的进程）直接读取磁盘缓存
+    other = DataAnalyzer()
+    other.cache_dir = analyzer.cache_dir
+    other_calls = stub_summary_analyses(other, monkeypatch, SUMMARY_COUNTS)
+    assert other.generate_analysis_summary()['languages'] == {'items': [{'name': 'analyze_programming_languages'}]}
+    assert other_calls == []
+
+    # 缓存过期后重新分析
+    expired = time.time() - analyzer.cache_ttl - 1
+    os.utime(cache_path, (expired, expired))
+    analyzer.generate_analysis_summary()
+    assert len(calls) == 10
+
+    # 数据变化后重新分析，并删除旧数据版本的缓存
+    changed = {**SUMMARY_COUNTS, 'total_topics': 2}
+    calls = stub_summary_analyses(analyzer, monkeypatch, changed)
+    analyzer.generate_analysis_summary()
+    assert len(calls) == 5
+    assert os.listdir(analyzer.cache_dir) == [f'summary_{DataAnalyzer._data_fingerprint(changed)}.json']
+
+    analyzer.clear_cache()
+    assert os.listdir(analyzer.cache_dir) == []
@@ -0,0 +1,361 @@
+"""DataProcessor回归测试
+
+将优化后的实现与原实现（每次调用re.sub、逐个映射查找、逐个格式尝试、逐行处理）的结果逐一比对，
+确保预编译正则、查找表、LRU缓存和按列批量处理不改变输出。
+"""
+import random
+import re
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_processing.data_processor import (
+    COMMON_COUNTRIES,
+    COMPANY_MAPPING,
+    LOCATION_MAPPING,
+    DataProcessor,
+)
+
+
+def old_clean_text(text, max_length=1000):
+    if not text:
+        return ''
+    text = str(text)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[^\w\s.,!?-]', '', text)
+    if len(text) > max_length:
+        text = text[:max_length] + '...'
+    return text.strip()
+
+
+def old_normalize_location(location):
+    if not location:
+        return None
+    location = str(location).strip()
+    location = re.sub(r'\s+', ' ', location)
+    location = location.replace(',,', ',').replace('  ', ' ')
+    location_lower = location.lower()
+    for key, value in LOCATION_MAPPING.items():
+        if key in location_lower:
+            return value
+    return location if location else None
+
+
+def old_extract_country_from_location(location):
+    if not location:
+        return None
+    parts = [p.strip() for p in location.split(',') if p.strip()]
+    if parts:
+        country_candidate = parts[-1].strip()
+        if country_candidate in COMMON_COUNTRIES:
+            return country_candidate
+        country_lower = country_candidate.lower()
+        for country in COMMON_COUNTRIES:
+            if country_lower == country.lower():
+                return country
+    return old_normalize_location(location)
+
+
+# 原实现中的公司名前后缀规则，按顺序逐个替换
+OLD_COMPANY_PATTERNS = [
+    r'^@',
+    r'^the\s+',
+    r',\s+inc\.?$',
+    r',\s+llc\.?$',
+    r',\s+corp\.?$',
+    r',\s+gmbh$',
+    r',\s+ag$',
+    r'\s+inc\.?$',
+    r'\s+llc\.?$',
+    r'\s+corp\.?$',
+    r'\s+gmbh$',
+    r'\s+ag$',
+]
+
+# 原实现中尝试的日期时间格式
+OLD_DATETIME_FORMATS = [
+    '%Y-%m-%dT%H:%M:%SZ',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d',
+    '%d/%m/%Y',
+    '%m/%d/%Y',
+]
+
+
+def old_normalize_company(company):
+    if not company:
+        return None
+    company = str(company).strip()
+    for pattern in OLD_COMPANY_PATTERNS:
+        company = re.sub(pattern, '', company, flags=re.IGNORECASE)
+    company_lower = company.lower()
+    for key, value in COMPANY_MAPPING.items():
+        if key == company_lower:
+            return value
+    return company if company else None
+
+
+def old_parse_datetime(date_string):
+    if not date_string:
+        return None
+    for fmt in OLD_DATETIME_FORMATS:
+        try:
+            return datetime.strptime(date_string, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def old_calculate_time_difference(start_date, end_date):
+    if not start_date or not end_date:
+        return None
+    if isinstance(start_date, str):
+        start_date = old_parse_datetime(start_date)
+    if isinstance(end_date, str):
+        end_date = old_parse_datetime(end_date)
+    if not start_date or not end_date:
+        return None
+    return (end_date - start_date).days
+
+
+def old_remove_outliers(data, column, method='iqr', threshold=1.5):
+    df = pd.DataFrame(data) if isinstance(data, list) else data.copy()
+    df_clean = df.dropna(subset=[column])
+    if method == 'iqr':
+        Q1 = df_clean[column].quantile(0.25)
+        Q3 = df_clean[column].quantile(0.75)
+        IQR = Q3 - Q1
+        lower_bound = Q1 - threshold * IQR
+        upper_bound = Q3 + threshold * IQR
+    else:
+        mean = df_clean[column].mean()
+        std = df_clean[column].std()
+        lower_bound = mean - threshold * std
+        upper_bound = mean + threshold * std
+    return df_clean[(df_clean[column] >= lower_bound) & (df_clean[column] <= upper_bound)]
+
+
+def old_normalize_numeric_data(data, column):
+    df = pd.DataFrame(data) if isinstance(data, list) else data.copy()
+    df_clean = df.dropna(subset=[column])
+    min_val = df_clean[column].min()
+    max_val = df_clean[column].max()
+    if max_val > min_val:
+        df[f"{column}_normalized"] = (df_clean[column] - min_val) / (max_val - min_val)
+    else:
+        df[f"{column}_normalized"] = 0
+    return df
+
+
+def make_numeric_frame(seed, size=300):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(100, 15, size)
+    values[rng.integers(0, size, 10)] = rng.choice([-500.0, 900.0, np.nan], 10)
+    return pd.DataFrame({
+        'value': values,
+        'count': rng.integers(0, 1000, size),
+        'name': [f'row{i}' for i in range(size)],
+    }, index=rng.permutation(size) * 2)
+
+
+TEXT_SAMPLES = [
+    None, '', '   ', 0, 42, 'hello', '  Hello,   World!  ', 'tabs\tand\nnewlines\r\n',
+    'special #$%^&*() chars', 'keep .,!?- punctuation', 'café résumé', '中文 描述，带标点！',
+    'emoji 🚀 rocket', 'under_score', 'a' * 1005, ' ' + 'b' * 999 + '  ', 'x' * 1000 + '#',
+]
+
+LOCATION_SAMPLES = [
+    None, '', '  ', 'San Francisco, CA, USA', 'London,,  UK', 'Beijing, China', 'berlin, deutschland',
+    'Paris', 'Sydney, Australia', 'Toronto, canada', 'Seoul, Republic of Korea', 'São Paulo, Brasil',
+    'Madrid, España', 'Istanbul, Türkiye', 'Amsterdam, NL', 'Somewhere', 'Earth', 'Remote',
+    'Zürich, Swiss', 'New York , US', ',', ' , , ', 'Hanoi, Viet Nam', 'Mumbai,India',
+]
+
+DATETIME_SAMPLES = [
+    None, '', '2024-01-02T03:04:05Z', '2024-02-30T03:04:05Z', '2024-01-02 03:04:05', '2024-01-02',
+    '02/01/2024', '12/31/2024', '31/12/2024', '13/13/2024', 'not a date', '2024-01-02T03:04:05',
+    '2024-01-02T03:04:05+00:00', '2024-1-2', ' 2024-01-02', '2024-01-02T24:00:00Z',
+]
+
+
+@pytest.mark.parametrize('text', TEXT_SAMPLES)
+def test_clean_text_matches_old(text):
+    assert DataProcessor.clean_text(text) == old_clean_text(text)
+    assert DataProcessor.clean_text(text, max_length=10) == old_clean_text(text, max_length=10)
+
+
+@pytest.mark.parametrize('location', LOCATION_SAMPLES)
+def test_location_functions_match_old(location):
+    assert DataProcessor.normalize_location(location) == old_normalize_location(location)
+    assert DataProcessor.extract_country_from_location(location) == old_extract_country_from_location(location)
+
+
+def test_normalize_company_matches_old():
+    samples = [
+        None, '', '@google', 'The Apache Software Foundation', 'Microsoft Corporation', 'Google LLC',
+        'Apple, Inc.', 'Apple Inc', 'SAP AG', 'Foo GmbH', 'Bar, gmbh', '@the meta platforms inc',
+        'Inc', ' inc.', 'the', '@', 'Acme Corp.', 'Acme, Corp', 'Acme Inc. LLC', 'Acme LLC Inc.',
+        'Acme\nInc.', 'Acme Inc.\n', 'The\nGoogle', '@\nthe github', 'AWS', 'x corp', 'Tag',
+        # 原实现的$也匹配末尾换行符之前的位置
+        'Foo llc\n, inc', 'Foo\n, llc\n, inc', 'X, inc\n, inc', 'Foo ag, llc\n, inc', 'Foo llc \n, inc',
+    ]
+    # 随机拼接前后缀片段，覆盖多个规则同时命中的情况
+    pieces = ['@', 'the ', 'The\t', 'acme', 'Google', ',', ' ', '\n', 'inc', 'Inc.', 'llc', 'corp.', 'gmbh', 'ag', '.']
+    rng = random.Random(20240101)
+    for _ in range(5000):
+        samples.append(''.join(rng.choice(pieces) for _ in range(rng.randint(1, 6))))
+
+    for company in samples:
+        assert DataProcessor.normalize_company(company) == old_normalize_company(company), repr(company)
+
+
+@pytest.mark.parametrize('date_string', DATETIME_SAMPLES)
+def test_parse_datetime_matches_old(date_string):
+    assert DataProcessor.parse_datetime(date_string) == old_parse_datetime(date_string)
+
+
+@pytest.mark.parametrize('start', ['2024-01-02T03:04:05Z', '2023-12-31', None, 'bad', datetime(2024, 1, 1, 12)])
+@pytest.mark.parametrize('end', ['2024-03-01 00:00:00', '01/02/2024', '', 'bad', datetime(2024, 6, 30)])
+def test_calculate_time_difference_matches_old(start, end):
+    assert DataProcessor.calculate_time_difference(start, end) == old_calculate_time_difference(start, end)
+
+
+def test_parse_datetime_series_matches_elementwise():
+    series = pd.Series(DATETIME_SAMPLES, dtype=object)
+    result = DataProcessor.parse_datetime_series(series)
+
+    assert list(result.index) == list(series.index)
+    for value, date_string in zip(result, DATETIME_SAMPLES):
+        expected = old_parse_datetime(date_string)
+        if expected is None:
+            assert pd.isna(value), repr(date_string)
+        else:
+            assert value.to_pydatetime() == expected, repr(date_string)
+
+
+def test_calculate_time_difference_series_matches_elementwise():
+    starts = ['2024-01-02T03:04:05Z', '2023-12-31', None, 'bad', '2024-05-01 23:59:59', '01/02/2024']
+    ends = ['2024-03-01 00:00:00', '01/02/2024', '2024-01-01', '2024-01-01', '2024-05-02 00:00:00', '']
+    result = DataProcessor.calculate_time_difference_series(pd.Series(starts), pd.Series(ends))
+
+    for value, start, end in zip(result, starts, ends):
+        expected = old_calculate_time_difference(start, end)
+        if expected is None:
+            assert pd.isna(value)
+        else:
+            assert value == expected
+
+    # 已经是datetime类型的列直接相减
+    start_dates = pd.Series([datetime(2024, 1, 1, 12), None], dtype='datetime64[ns]')
+    end_dates = pd.Series([datetime(2024, 1, 3, 11), datetime(2024, 1, 3)], dtype='datetime64[ns]')
+    result = DataProcessor.calculate_time_difference_series(start_dates, end_dates)
+    assert result[0] == 1
+    assert pd.isna(result[1])
+
+
+@pytest.mark.parametrize('method', ['iqr', 'zscore'])
+@pytest.mark.parametrize('column', ['value', 'count'])
+@pytest.mark.parametrize('threshold', [1.5, 0.5, 3])
+def test_remove_outliers_matches_old(method, column, threshold):
+    for seed in range(5):
+        df = make_numeric_frame(seed)
+        pd.testing.assert_frame_equal(
+            DataProcessor.remove_outliers(df, column, method=method, threshold=threshold),
+            old_remove_outliers(df, column, method=method, threshold=threshold)
+        )
+
+    records = make_numeric_frame(9).to_dict('records')
+    pd.testing.assert_frame_equal(
+        DataProcessor.remove_outliers(records, column, method=method),
+        old_remove_outliers(records, column, method=method)
+    )
+
+
+@pytest.mark.parametrize('method', ['iqr', 'zscore'])
+@pytest.mark.parametrize('values', [[], [np.nan, np.nan], [5.0], [5.0, 5.0, 5.0]])
+def test_remove_outliers_degenerate_columns(method, values):
+    df = pd.DataFrame({'value': values}, dtype=float)
+    pd.testing.assert_frame_equal(
+        DataProcessor.remove_outliers(df, 'value', method=method),
+        old_remove_outliers(df, 'value', method=method)
+    )
+
+
+@pytest.mark.parametrize('column', ['value', 'count'])
+def test_normalize_numeric_data_matches_old(column):
+    df = make_numeric_frame(3)
+    pd.testing.assert_frame_equal(
+        DataProcessor.normalize_numeric_data(df, column),
+        old_normalize_numeric_data(df, column)
+    )
+    for values in ([np.nan, np.nan], [5.0, 5.0, np.nan], [1.0, np.nan, 3.0]):
+        df = pd.DataFrame({column: values})
+        pd.testing.assert_frame_equal(
+            DataProcessor.normalize_numeric_data(df, column),
+            old_normalize_numeric_data(df, column)
+        )
+
+
+def test_remove_outliers_and_normalize_leave_input_unchanged():
+    df = make_numeric_frame(5)
+    original = df.copy()
+
+    filtered = DataProcessor.remove_outliers(df, 'value')
+    filtered['extra'] = 1
+    normalized = DataProcessor.normalize_numeric_data(df, 'value')
+    normalized['extra'] = 1
+
+    assert 'value_normalized' not in df.columns
+    pd.testing.assert_frame_equal(df, original)
+
+
+@pytest.mark.parametrize('column, method', [('missing', 'iqr'), ('value', 'unknown')])
+def test_remove_outliers_error_paths_return_copy(column, method):
+    df = make_numeric_frame(1)
+    original = df.copy()
+
+    result = DataProcessor.remove_outliers(df, column, method=method)
+
+    assert result is not df
+    pd.testing.assert_frame_equal(result, original)
+    result['value'] = 0
+    pd.testing.assert_frame_equal(df, original)
+
+
+def test_clean_text_series_matches_elementwise():
+    texts = TEXT_SAMPLES + [False, 0.0, True, 3.5]
+    for max_length in (1000, 10):
+        result = DataProcessor.clean_text_series(pd.Series(texts, dtype=object), max_length=max_length)
+        assert result.tolist() == [old_clean_text(text, max_length=max_length) for text in texts]
+
+    # 数值列中的0同样视为空文本，缺失值（NaN）视为空文本
+    result = DataProcessor.clean_text_series(pd.Series([0, 1, 2.5, np.nan]))
+    assert result.tolist() == ['', '1.0', '2.5', '']
+
+
+# pandas 3不再接受resample的'M'、'Y'，改用等价的'ME'、'YE'计算期望结果
+RESAMPLE_ALIASES = {'M': 'ME', 'Y': 'YE'}
+
+
+@pytest.mark.parametrize('freq', ['D', 'W', 'M', 'h', 'MS', 'ME', 'Y', '2D', '3h'])
+@pytest.mark.parametrize('as_list', [False, True])
+def test_aggregate_data_by_time_matches_resample(freq, as_list):
+    rng = np.random.default_rng(9)
+    size = 400
+    # 跨一年多的随机时间，包含缺失的日期和计数列中的缺失值
+    dates = pd.Series(pd.Timestamp('2023-01-01 00:00:00') + pd.to_timedelta(rng.integers(0, 400 * 86400, size), unit='s'))
+    dates[rng.integers(0, size, 5)] = pd.NaT
+    values = rng.normal(0, 1, size)
+    values[rng.integers(0, size, 20)] = np.nan
+    df = pd.DataFrame({'created_at': dates, 'value': values})
+    data = df.to_dict('records') if as_list else df
+
+    try:
+        expected = df.resample(freq, on='created_at')['value'].count().reset_index()
+    except ValueError:
+        expected = df.resample(RESAMPLE_ALIASES[freq], on='created_at')['value'].count().reset_index()
+
+    result = DataProcessor.aggregate_data_by_time(data, 'created_at', 'value', freq=freq)
+    pd.testing.assert_frame_equal(result, expected, check_freq=False)